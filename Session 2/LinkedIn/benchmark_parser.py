@@ -0,0 +1,102 @@
+# Parser Benchmark - Compares the old per-field soup.find parsing with job_parser
+# Run: python benchmark_parser.py [repetitions]
+
+import glob
+import os
+import sys
+import time
+from bs4 import BeautifulSoup
+import job_parser
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _text_or_na(element, limit=None) -> str:
+    if element is None:
+        return "N/A"
+    text = element.get_text(strip=True)
+    return text[:limit] if limit else text
+
+
+def _criterion(soup: BeautifulSoup, heading: str) -> str:
+    criteria_list = soup.find('ul', class_='description__job-criteria-list')
+    if criteria_list:
+        for item in criteria_list.find_all('li'):
+            if heading in item.get_text():
+                return item.find('span', class_='description__job-criteria-text').get_text(strip=True)
+    return "N/A"
+
+
+def legacy_parse(content) -> dict:
+    """The original extraction: a full html.parser tree and one soup.find pass per field"""
+    soup = BeautifulSoup(content, 'html.parser')
+    return {
+        'title': _text_or_na(soup.find('h1', class_='top-card-layout__title') or soup.find('h1')),
+        'company': _text_or_na(soup.find('a', class_='topcard__org-name-link')
+                               or soup.find('span', class_='topcard__flavor')),
+        'location': _text_or_na(soup.find('span', class_='topcard__flavor topcard__flavor--bullet')
+                                or soup.find('span', class_='topcard__flavor--bullet')),
+        'description': _text_or_na(soup.find('div', class_='show-more-less-html__markup')
+                                   or soup.find('div', class_='description__text'), 1000),
+        'posted_date': _text_or_na(soup.find('span', class_='posted-time-ago__text')),
+        'job_type': _criterion(soup, 'Employment type'),
+        'experience_level': _criterion(soup, 'Seniority level'),
+    }
+
+
+def stream_parse(content: bytes, chunk_size: int = 16 * 1024) -> dict:
+    """Feed the page to StreamingJobParser in download-sized chunks, as job_extractor does"""
+    parser = job_parser.StreamingJobParser()
+    for start in range(0, len(content), chunk_size):
+        parser.feed(content[start:start + chunk_size].decode('utf-8', errors='replace'))
+    parser.close()
+    return parser.result()
+
+
+def time_parser(parse, pages: list, repetitions: int) -> float:
+    """Return the mean parse time per page in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for page in pages:
+            parse(page)
+    return (time.perf_counter() - start) * 1000 / (repetitions * len(pages))
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    pages = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, 'job_page_*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+
+    # Both paths must agree before their timings mean anything
+    for page in pages:
+        expected = legacy_parse(page)
+        if job_parser.parse_job_page(page) != expected:
+            print("Warning: single-pass parser output differs from the legacy parser")
+        if stream_parse(page) != expected:
+            print("Warning: streaming parser output differs from the legacy parser")
+
+    paths = [('legacy (html.parser + per-field find)', legacy_parse)]
+    if job_parser.HAS_LXML:
+        paths.append(('single-pass (lxml)', job_parser._parse_with_lxml))
+    paths.append(('single-pass (SoupStrainer)', job_parser._parse_with_soup))
+
+    size_kb = sum(len(page) for page in pages) / len(pages) / 1024
+    print(f"{len(pages)} fixture page(s), {size_kb:.0f} KB average, {repetitions} repetitions\n")
+
+    baseline = None
+    for name, parse in paths:
+        ms_per_page = time_parser(parse, pages, repetitions)
+        baseline = baseline or ms_per_page
+        print(f"{name:<40} {ms_per_page:8.2f} ms/page  ({baseline / ms_per_page:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
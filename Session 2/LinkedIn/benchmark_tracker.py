@@ -0,0 +1,133 @@
+# Tracker Benchmark - Runs --process and --digest end to end against local fake backends
+# Run: python benchmark_tracker.py [url_counts...]   (default: 10 1000 10000)
+
+import contextlib
+import glob
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import config
+from email_notifier import EmailNotifier
+from fake_backends import FakeDriveService, FakeSheetsService, FixtureServer, SMTPSink
+from google_sheets_manager import GoogleSheetsManager
+from instrumentation import metrics
+from job_extractor import LinkedInJobExtractor
+from main import LinkedInJobTracker
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+SHEETS_LATENCY = 0.05  # seconds per fake Sheets API call
+SHEETS_QUOTA = 300  # fake per-minute read and write quotas; the tracker is told the same limits
+PAGE_LATENCY = 0.02  # seconds before the fixture server answers
+SMTP_LATENCY = 0.01  # seconds the SMTP sink takes to accept a message
+DIGEST_RUNS = 5
+
+# Spans whose p95 is shown for every run
+REPORTED_SPANS = ['fetch', 'parse', 'sheets.values.batchUpdate', 'smtp.send']
+
+
+def configure(sink: SMTPSink):
+    """Point the tracker at the local backends and lift limits meant for LinkedIn"""
+    config.FETCH_CONFIG.update(requests_per_second=10000, burst=1000, max_in_flight=16, pool_size=16)
+    config.EMAIL_CONFIG.update(smtp_server='127.0.0.1', smtp_port=sink.port, use_tls=False,
+                               sender_email='bench@example.com', sender_password='unused',
+                               recipient_email='bench@example.com')
+    config.OUTBOX_CONFIG.update(flush_timeout_seconds=600)
+    config.SHEETS_QUOTA_CONFIG.update(read_requests_per_minute=SHEETS_QUOTA,
+                                      write_requests_per_minute=SHEETS_QUOTA)
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_size(count: int, fixtures: FixtureServer, sink: SMTPSink) -> dict:
+    """Process `count` new job URLs, then send the digest, in a scratch directory"""
+    workdir = tempfile.mkdtemp(prefix='tracker-bench-')
+    previous_dir = os.getcwd()
+    os.chdir(workdir)
+    metrics.reset()
+    emails_before = sink.count
+    try:
+        with open(config.SAVED_JOBS_FILE, 'w') as f:
+            f.writelines(f"https://www.linkedin.com/jobs/view/{4000000000 + i}/?trk=bench\n"
+                         for i in range(count))
+
+        sheets = FakeSheetsService(latency=SHEETS_LATENCY, quota_per_minute=SHEETS_QUOTA)
+        manager = GoogleSheetsManager(service=sheets, drive_service=FakeDriveService(sheets))
+        extractor = LinkedInJobExtractor()
+        fixtures.install(extractor.session)
+        tracker = LinkedInJobTracker(extractor, manager, EmailNotifier())
+
+        # The tracker prints a line per job; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.create_spreadsheet()
+            started = time.perf_counter()
+            tracker.process_new_jobs()
+            process_seconds = time.perf_counter() - started
+
+            digest_seconds = []
+            for _ in range(DIGEST_RUNS):
+                started = time.perf_counter()
+                tracker.send_daily_digest()
+                digest_seconds.append(time.perf_counter() - started)
+        extractor.close()
+        tracker.close()
+
+        report = metrics.report()
+        return {
+            'count': count,
+            'process_seconds': process_seconds,
+            'rows': len(sheets._read("A2:A")),
+            'sheets_calls': sum(sheets.calls.values()),
+            'quota_errors': sheets.quota_errors,
+            'emails': sink.count - emails_before,
+            'digest_p95': percentile(digest_seconds, 0.95),
+            'span_p95': {name: report['spans'][name]['p95_ms']
+                         for name in REPORTED_SPANS if name in report['spans']},
+        }
+    finally:
+        os.chdir(previous_dir)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 1000, 10000]
+
+    pages = sorted(glob.glob(os.path.join(FIXTURES_DIR, 'job_page_*.html')))
+    if not pages:
+        print(f"No fixtures found in {FIXTURES_DIR}")
+        return
+
+    fixtures = FixtureServer(pages, latency=PAGE_LATENCY)
+    sink = SMTPSink(latency=SMTP_LATENCY)
+    configure(sink)
+    print(f"Fake latencies: page {PAGE_LATENCY * 1000:.0f} ms, Sheets call {SHEETS_LATENCY * 1000:.0f} ms, "
+          f"SMTP {SMTP_LATENCY * 1000:.0f} ms; Sheets quota {SHEETS_QUOTA}/min; "
+          f"{config.FETCH_CONFIG['max_in_flight']} pages in flight\n")
+
+    try:
+        for count in counts:
+            result = run_size(count, fixtures, sink)
+            print(f"{count} URLs")
+            print(f"  --process  {result['process_seconds']:8.2f} s   "
+                  f"{count / result['process_seconds']:8.1f} jobs/s   "
+                  f"{result['rows']} rows, {result['sheets_calls']} Sheets calls "
+                  f"({result['quota_errors']} throttled), {result['emails']} emails")
+            print(f"  --digest   {result['digest_p95'] * 1000:8.1f} ms p95 over {DIGEST_RUNS} runs")
+            print("  p95 " + ", ".join(f"{name} {ms:.1f} ms" for name, ms in result['span_p95'].items()))
+            if result['rows'] != count:
+                print(f"  Warning: expected {count} rows in the sheet")
+    finally:
+        fixtures.close()
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
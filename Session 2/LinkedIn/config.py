@@ -5,33 +5,168 @@ JOB_CRITERIA = {
     "keywords": ["education", "edtech", "project manager", "non-profit"],
     "job_titles": ["Project Manager", "Program Manager", "Education Manager"],
     "industries": ["Education", "EdTech", "Non-Profit"],
+    "job_types": ["Full-time"],
     "experience_level": "Mid-Senior level",
 }
 
+# Job Scoring (each job gets a 0-100 Score column from JOB_CRITERIA)
+SCORING_CONFIG = {
+    "weights": {  # Points per criterion, scaled so a perfect match scores 100
+        "title": 35,  # A wanted job title in the title
+        "keyword": 30,  # Keywords found in the title or description
+        "industry": 15,  # An industry in the title, company or description
+        "job_type": 10,  # A wanted job type
+        "seniority": 10,  # The wanted experience level
+    },
+    "digest_min_score": 0,  # Leave jobs scoring below this out of the daily digest
+    "digest_sort_by_score": True,  # Best matches first in the digest
+}
+
+# Job Page Fetching
+FETCH_CONFIG = {
+    "max_in_flight": 4,  # Maximum number of job pages downloaded at the same time
+    "requests_per_second": 1.0,  # Per-host request rate (keep this low to be respectful)
+    "burst": 2,  # Requests allowed back-to-back before the rate limit kicks in
+    "pool_size": 4,  # Keep-alive connections kept open per host
+    "max_retries": 3,  # Retries on 429 and 5xx responses
+    "backoff_factor": 1.0,  # Retry delays grow as 1s, 2s, 4s, ...
+    "streaming": True,  # Stop parsing a page once all job fields are found
+    "chunk_size": 16384,  # Bytes read per chunk in streaming mode
+    # After an early stop, the rest of the page is still read (and thrown away) if it is at most
+    # this many bytes, so the keep-alive connection goes back to the pool. A longer rest is not
+    # downloaded, but that connection is closed and the next request pays a new TCP/TLS handshake.
+    "drain_max_bytes": 256 * 1024,
+}
+
+# Job Page Cache (avoids re-downloading pages that were already processed)
+CACHE_CONFIG = {
+    "enabled": True,
+    "directory": ".job_page_cache",  # Folder with the validators and parsed fields of each page
+    "ttl_hours": 168,  # Cached pages older than this are downloaded again
+    "max_size_mb": 50,  # Least recently used entries are removed above this size
+}
+
 # Google Sheets Configuration
 GOOGLE_SHEETS_CONFIG = {
     "spreadsheet_name": "LinkedIn Job Applications Tracker",
     "worksheet_name": "Jobs",
+    "spreadsheet_id": "1XiK20cWEPF-rNU1BydJwtGHRIjvqUGAQhDA40mNMcT4",  # Sheet used when no profiles are set
+}
+
+# Google Sheets API Quota (calls are paced to stay under it and retried when throttled)
+SHEETS_QUOTA_CONFIG = {
+    "read_requests_per_minute": 60,  # Sheets API default per-user read quota
+    "write_requests_per_minute": 60,  # Sheets API default per-user write quota
+    "burst": 10,  # Calls that may go out back to back before pacing starts
+    "additive_increase": 0.05,  # After a success, raise the pace by this share of the quota
+    "decrease_factor": 0.5,  # After a 429, multiply the pace by this
+    "max_retries": 6,  # Give up on a call after this many throttled/5xx attempts
+    "backoff_base_seconds": 1.0,  # Retry delays are random, up to base * 2^attempt
+    "backoff_max_seconds": 64,
+}
+
+# Local copy of the Jobs worksheet (digests and reminders read from it)
+REPLICA_CONFIG = {
+    "enabled": True,
+    "path": "jobs_replica.db",  # SQLite file holding the local copy
+    "max_staleness_minutes": 30,  # Re-download after this long if the sheet revision can't be checked
 }
 
 # Email Configuration (for daily alerts)
 EMAIL_CONFIG = {
     "smtp_server": "smtp.gmail.com",  # Change if not using Gmail
     "smtp_port": 587,
+    "use_tls": True,  # STARTTLS before logging in (only a local test server would turn this off)
     "sender_email": "manitha.kpm@gmail.com",  # UPDATE THIS
     "sender_password": "tegn kbmf bfjc jlqp",  # Use App Password for Gmail
     "recipient_email": "manitha.kpm@gmail.com",  # UPDATE THIS
     "send_daily_digest": True,
     "digest_time": "09:00",  # Send digest at 9 AM daily
+    "notification_mode": "batched",  # "batched" = one email per batch of new jobs, "per_job" = one email each
+    "max_jobs_per_email": 25,  # Largest number of jobs in one batched notification
+}
+
+# Outgoing Email Queue (emails are saved to disk and retried until delivered)
+OUTBOX_CONFIG = {
+    "enabled": True,
+    "directory": "outbox",  # Folder holding emails waiting to be sent
+    "max_attempts": 8,  # Give up (move to outbox/failed) after this many failures
+    "retry_base_seconds": 30,  # First retry delay; doubles after every failure
+    "retry_max_seconds": 3600,  # Longest delay between retries
+    "flush_timeout_seconds": 60,  # How long a run waits for queued emails before exiting
+}
+
+# Incremental Reading of saved_jobs.txt (the file itself is never rewritten)
+INGEST_CONFIG = {
+    "checkpoint_file": "saved_jobs.offset.json",  # How far saved_jobs.txt has been read
+    "journal_file": "ingest_journal.jsonl",  # Progress of every URL (pending/fetched/written/notified)
+    "compact_after_records": 1000,  # Drop finished URLs from the journal once it's this long
+}
+
+# Processing Pipeline (extraction, Sheets writes and emails run at the same time)
+PIPELINE_CONFIG = {
+    "queue_size": 100,  # Jobs waiting between stages before extraction pauses
+    "write_batch_size": 10,  # Jobs per sheet write when the sheet keeps up
+    "write_max_wait_seconds": 2.0,  # Write a smaller batch once its first job has waited this long
+    "max_write_batch_size": 100,  # Largest write, used when jobs pile up behind the Sheets quota
+}
+
+# Duplicate Detection (jobs already in the tracker are never fetched again)
+DEDUP_CONFIG = {
+    "seen_jobs_file": "seen_jobs.db",  # Every job URL added to the sheet
+    "expected_jobs": 100000,  # Bloom filter size; it doubles automatically when exceeded
+    "false_positive_rate": 0.001,  # Share of new jobs that need a disk lookup
+    "bloom_save_every": 1000,  # New jobs between saves of the filter (it is also saved on exit)
+}
+
+# Repost Detection (jobs whose title and description nearly match an earlier job get "Duplicate Of")
+NEAR_DUPLICATE_CONFIG = {
+    "enabled": True,
+    "index_file": "near_duplicates.db",  # MinHash signatures and LSH buckets of every tracked job
+    "num_perm": 64,  # MinHash signature length
+    "bands": 16,  # LSH bands (num_perm must be a multiple); more bands catch less similar pairs
+    "threshold": 0.8,  # Estimated similarity above which a job counts as a repost
+}
+
+# Run Reports (per-stage timings and counters, written when a command finishes)
+INSTRUMENTATION_CONFIG = {
+    "report_file": "run_report.json",  # JSON summary of the last run (None to skip)
+    "prometheus_file": None,  # e.g. "job_tracker.prom" for node_exporter's textfile collector
+}
+
+# Daemon Mode (python main.py --daemon)
+DAEMON_CONFIG = {
+    "poll_seconds": 5,  # How often saved_jobs.txt is checked for new URLs
+    "batch_size": 10,  # Process as soon as this many URLs are waiting
+    "max_batch_wait_seconds": 30,  # ...or once the oldest waiting URL is this old
+    "status_file": "daemon_status.json",  # Queue depth and per-stage latency, rewritten every poll
+    "retry_base_seconds": 30,  # Wait before retrying a failed batch; doubles after every failure
+    "retry_max_seconds": 900,  # Longest wait between retries
 }
 
 # Reminder Configuration
 REMINDER_CONFIG = {
     "follow_up_days": 7,  # Remind to follow up after 7 days
     "application_deadline_reminder": 2,  # Remind 2 days before deadline
+    "state_file": "reminders.json",  # Scheduled and already-sent reminders
+}
+
+# Search Profiles (track jobs for several people in one run; leave empty for a single tracker)
+# Each profile has its own URL file, sheet and recipient; its journal, seen jobs, outbox,
+# reminders and sheet replica are kept in PROFILES_DIR/<name>. Jobs saved by several
+# profiles are downloaded once per run.
+PROFILES = {
+    # "alex": {
+    #     "saved_jobs_file": "profiles/alex/saved_jobs.txt",  # Default: PROFILES_DIR/<name>/saved_jobs.txt
+    #     "spreadsheet_id": "YOUR_SPREADSHEET_ID",  # Created by python main.py --setup alex
+    #     "recipient_email": "alex@example.com",  # Default: EMAIL_CONFIG["recipient_email"]
+    #     "job_criteria": {...},  # Same shape as JOB_CRITERIA (default: JOB_CRITERIA)
+    # },
 }
+PROFILES_DIR = "profiles"
 
 # File Paths
 SAVED_JOBS_FILE = "saved_jobs.txt"  # File where job URLs are stored
 CREDENTIALS_FILE = "credentials.json"  # Google Sheets API credentials
 TOKEN_FILE = "token.json"  # Google Sheets API token
+DISCOVERY_CACHE_DIR = ".discovery_cache"  # Cached Google API discovery documents
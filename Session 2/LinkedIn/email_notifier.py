@@ -1,43 +1,189 @@
 # Email Notifier - Sends daily digests and reminders
 
 import smtplib
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime, timedelta
 from typing import List, Dict
+from email_outbox import EmailOutbox
+from instrumentation import metrics
+import email_templates
 import config
 
 
+class SMTPSender:
+    """Sends many messages over one authenticated SMTP connection"""
+
+    def __init__(self, smtp_server: str, smtp_port: int, username: str, password: str,
+                 use_tls: bool = True):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.server = None
+        self.connections = 0
+        self.messages_sent = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def connect(self):
+        """Open the connection, upgrade it to TLS and log in"""
+        self.close()
+        with metrics.span('smtp.connect'):
+            self.server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+            if self.use_tls:
+                self.server.starttls()
+            self.server.login(self.username, self.password)
+        self.connections += 1
+
+    def send(self, message):
+        """
+        Send a message, connecting on first use
+
+        If the server has dropped the connection (idle timeout, per-connection
+        limits), reconnect once and retry.
+        """
+        if self.server is None:
+            self.connect()
+
+        with metrics.span('smtp.send'):
+            try:
+                self.server.send_message(message)
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPSenderRefused, ConnectionError):
+                metrics.count('smtp_reconnects')
+                self.connect()
+                self.server.send_message(message)
+
+        self.messages_sent += 1
+        metrics.count('emails_sent')
+
+    def close(self):
+        if self.server is None:
+            return
+        try:
+            self.server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass  # connection already gone
+        self.server = None
+
+    @property
+    def messages_per_connection(self) -> float:
+        return self.messages_sent / self.connections if self.connections else 0.0
+
+
 class EmailNotifier:
     """Handles email notifications for job applications"""
 
-    def __init__(self):
+    def __init__(self, recipient_email: str = None, outbox_directory: str = None):
         self.smtp_server = config.EMAIL_CONFIG['smtp_server']
         self.smtp_port = config.EMAIL_CONFIG['smtp_port']
         self.sender_email = config.EMAIL_CONFIG['sender_email']
         self.sender_password = config.EMAIL_CONFIG['sender_password']
-        self.recipient_email = config.EMAIL_CONFIG['recipient_email']
+        self.recipient_email = recipient_email or config.EMAIL_CONFIG['recipient_email']
+        self.outbox_directory = outbox_directory or config.OUTBOX_CONFIG['directory']
+        self.sender = None  # shared SMTPSender while inside connection()
+        self.outbox = None  # background delivery queue, see start_outbox()
 
-    def send_email(self, subject: str, body: str, html: bool = True):
-        """Send an email"""
+    def _create_sender(self) -> SMTPSender:
+        return SMTPSender(self.smtp_server, self.smtp_port, self.sender_email, self.sender_password,
+                          use_tls=config.EMAIL_CONFIG.get('use_tls', True))
+
+    @contextmanager
+    def connection(self):
+        """
+        Reuse one authenticated SMTP connection for every email sent in the block
+
+        While the outbox is running, emails are only queued and its worker
+        keeps its own connection, so the block doesn't open one.
+
+        Usage:
+            with notifier.connection():
+                for job in jobs:
+                    notifier.send_new_job_notification(job)
+        """
+        if self.outbox is not None or self.sender is not None:
+            yield self.sender  # queued for the outbox, or already inside a batch
+            return
+
+        self.sender = self._create_sender()
         try:
-            message = MIMEMultipart('alternative')
-            message['From'] = self.sender_email
-            message['To'] = self.recipient_email
-            message['Subject'] = subject
+            yield self.sender
+        finally:
+            sender, self.sender = self.sender, None
+            sender.close()
+            if sender.messages_sent:
+                print(f"Sent {sender.messages_sent} email(s) over {sender.connections} connection(s) "
+                      f"({sender.messages_per_connection:.1f} per connection)")
+
+    def start_outbox(self):
+        """
+        Queue emails on disk and deliver them in the background from now on
 
-            if html:
-                part = MIMEText(body, 'html')
-            else:
-                part = MIMEText(body, 'plain')
+        Messages left over from earlier runs are delivered as well.
+        """
+        if self.outbox is None:
+            self.outbox = EmailOutbox(
+                self.outbox_directory,
+                self._create_sender,
+                self._build_message,
+                max_attempts=config.OUTBOX_CONFIG['max_attempts'],
+                retry_base_seconds=config.OUTBOX_CONFIG['retry_base_seconds'],
+                retry_max_seconds=config.OUTBOX_CONFIG['retry_max_seconds'],
+            )
+        self.outbox.start()
+
+    def stop_outbox(self, timeout: float = None):
+        """Wait (up to the configured flush timeout) for queued emails, then stop the worker"""
+        if self.outbox is None:
+            return
+        if timeout is None:
+            timeout = config.OUTBOX_CONFIG['flush_timeout_seconds']
+
+        remaining = self.outbox.stop(timeout)
+        stats = self.outbox.stats
+        if stats['delivered']:
+            print(f"Outbox: sent {stats['delivered']} email(s) over {stats['connections']} connection(s) "
+                  f"({stats['delivered'] / max(stats['connections'], 1):.1f} per connection)")
+        if remaining:
+            print(f"Outbox: {remaining} email(s) still queued, they will be retried on the next run")
+        self.outbox = None
+
+    def _build_message(self, subject: str, body: str, html: bool = True) -> MIMEMultipart:
+        message = MIMEMultipart('alternative')
+        message['From'] = self.sender_email
+        message['To'] = self.recipient_email
+        message['Subject'] = subject
+
+        if html:
+            part = MIMEText(body, 'html')
+        else:
+            part = MIMEText(body, 'plain')
 
-            message.attach(part)
+        message.attach(part)
+        return message
 
-            # Connect to SMTP server and send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+    def send_email(self, subject: str, body: str, html: bool = True):
+        """Send an email (or queue it for background delivery when the outbox is running)"""
+        try:
+            if self.outbox is not None:
+                self.outbox.enqueue(subject, body, html)
+                print(f"Email queued: {subject}")
+                return True
+
+            message = self._build_message(subject, body, html)
+
+            # Use the batch connection if there is one, otherwise a one-off connection
+            if self.sender is not None:
+                self.sender.send(message)
+            else:
+                with self._create_sender() as sender:
+                    sender.send(message)
 
             print(f"Email sent successfully: {subject}")
             return True
@@ -51,79 +197,7 @@ class EmailNotifier:
 
         subject = f"LinkedIn Job Tracker - Daily Digest ({datetime.now().strftime('%Y-%m-%d')})"
 
-        # Build HTML email body
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                h2 {{ color: #0066cc; }}
-                .job-card {{
-                    border: 1px solid #ddd;
-                    padding: 15px;
-                    margin: 10px 0;
-                    border-radius: 5px;
-                    background-color: #f9f9f9;
-                }}
-                .job-title {{ font-weight: bold; font-size: 18px; color: #0066cc; }}
-                .company {{ color: #666; font-size: 14px; }}
-                .details {{ margin-top: 10px; }}
-                .label {{ font-weight: bold; }}
-                .reminder {{ background-color: #fff3cd; padding: 10px; border-left: 4px solid #ffc107; }}
-                a {{ color: #0066cc; text-decoration: none; }}
-                a:hover {{ text-decoration: underline; }}
-            </style>
-        </head>
-        <body>
-            <h1>Your Daily Job Tracker Update</h1>
-            <p>Hello! Here's your daily summary from LinkedIn Job Tracker.</p>
-        """
-
-        # Add new jobs section
-        if new_jobs:
-            html_body += f"""
-            <h2>🆕 New Jobs Saved Today ({len(new_jobs)})</h2>
-            """
-
-            for job in new_jobs:
-                html_body += f"""
-                <div class="job-card">
-                    <div class="job-title">{job.get('title', 'N/A')}</div>
-                    <div class="company">{job.get('company', 'N/A')} - {job.get('location', 'N/A')}</div>
-                    <div class="details">
-                        <p><span class="label">Experience Level:</span> {job.get('experience_level', 'N/A')}</p>
-                        <p><span class="label">Job Type:</span> {job.get('job_type', 'N/A')}</p>
-                        <p><span class="label">Posted:</span> {job.get('posted_date', 'N/A')}</p>
-                        <p><a href="{job.get('url', '#')}" target="_blank">View Job Posting →</a></p>
-                    </div>
-                </div>
-                """
-        else:
-            html_body += "<p>No new jobs saved today.</p>"
-
-        # Add follow-up reminders section
-        if pending_followups:
-            html_body += f"""
-            <h2>⏰ Follow-up Reminders ({len(pending_followups)})</h2>
-            """
-
-            for followup in pending_followups:
-                html_body += f"""
-                <div class="reminder">
-                    <p><span class="label">Job:</span> {followup.get('title', 'N/A')} at {followup.get('company', 'N/A')}</p>
-                    <p><span class="label">Action:</span> {followup.get('reminder_reason', 'Follow up required')}</p>
-                </div>
-                """
-
-        html_body += """
-            <hr>
-            <p style="color: #666; font-size: 12px;">
-                This is an automated email from LinkedIn Job Tracker.<br>
-                To update your preferences, edit the config.py file.
-            </p>
-        </body>
-        </html>
-        """
+        html_body = email_templates.render_digest(new_jobs, pending_followups)
 
         return self.send_email(subject, html_body, html=True)
 
@@ -132,33 +206,37 @@ class EmailNotifier:
 
         subject = f"New Job Saved: {job.get('title', 'N/A')}"
 
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif;">
-            <h2>New Job Added to Tracker</h2>
-            <p>A new job has been saved to your LinkedIn Job Tracker:</p>
-
-            <div style="border: 1px solid #ddd; padding: 15px; border-radius: 5px;">
-                <h3 style="color: #0066cc;">{job.get('title', 'N/A')}</h3>
-                <p><strong>Company:</strong> {job.get('company', 'N/A')}</p>
-                <p><strong>Location:</strong> {job.get('location', 'N/A')}</p>
-                <p><strong>Experience Level:</strong> {job.get('experience_level', 'N/A')}</p>
-                <p><strong>Job Type:</strong> {job.get('job_type', 'N/A')}</p>
-                <p><strong>Posted:</strong> {job.get('posted_date', 'N/A')}</p>
-                <p><a href="{job.get('url', '#')}" style="color: #0066cc;">View Job Posting</a></p>
-            </div>
-
-            <p style="margin-top: 20px;">
-                <a href="https://docs.google.com/spreadsheets" style="background-color: #0066cc; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
-                    Open Job Tracker
-                </a>
-            </p>
-        </body>
-        </html>
-        """
+        html_body = email_templates.render_new_jobs(
+            [job], "New Job Added to Tracker",
+            "A new job has been saved to your LinkedIn Job Tracker:"
+        )
 
         return self.send_email(subject, html_body, html=True)
 
+    def send_new_jobs_notification(self, jobs: List[Dict]) -> bool:
+        """
+        Send one notification covering many newly saved jobs
+
+        Jobs are split into emails of at most EMAIL_CONFIG['max_jobs_per_email'].
+        Returns True if every email was sent (or queued).
+        """
+        max_jobs = max(1, config.EMAIL_CONFIG['max_jobs_per_email'])
+        batches = [jobs[i:i + max_jobs] for i in range(0, len(jobs), max_jobs)]
+
+        all_sent = True
+        for number, batch in enumerate(batches, 1):
+            part = f" (part {number}/{len(batches)})" if len(batches) > 1 else ""
+            subject = f"{len(batch)} New Job(s) Saved{part}"
+
+            html_body = email_templates.render_new_jobs(
+                batch, f"{len(batch)} New Job(s) Added to Tracker",
+                "These jobs have been saved to your LinkedIn Job Tracker:"
+            )
+
+            all_sent = self.send_email(subject, html_body, html=True) and all_sent
+
+        return all_sent
+
     def send_reminder(self, reminder_type: str, job: Dict):
         """Send reminder for follow-ups or deadlines"""
 
@@ -172,20 +250,7 @@ class EmailNotifier:
             subject = "Job Application Reminder"
             message = "You have a pending action for this job application."
 
-        html_body = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif;">
-            <h2 style="color: #ffc107;">⏰ Reminder</h2>
-            <p>{message}</p>
-
-            <div style="border-left: 4px solid #ffc107; background-color: #fff3cd; padding: 15px;">
-                <h3>{job.get('title', 'N/A')}</h3>
-                <p><strong>Company:</strong> {job.get('company', 'N/A')}</p>
-                <p><a href="{job.get('url', '#')}" style="color: #0066cc;">View Job Posting</a></p>
-            </div>
-        </body>
-        </html>
-        """
+        html_body = email_templates.render_reminder(message, job)
 
         return self.send_email(subject, html_body, html=True)
 
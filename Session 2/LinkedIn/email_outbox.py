@@ -0,0 +1,208 @@
+# Email Outbox - Persistent queue of outgoing emails with background delivery
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+
+
+class EmailOutbox:
+    """
+    On-disk queue of emails delivered by a background thread
+
+    Every message is written to its own JSON file before send_email returns,
+    so nothing is lost if delivery fails or the process exits. Failed sends
+    are retried with exponential backoff; messages still queued when a run
+    ends are picked up again by the next run. The worker keeps its SMTP
+    connection open while messages keep coming; stats['connections'] counts
+    the connections it opened.
+    """
+
+    def __init__(self, directory: str, sender_factory: Callable, build_message: Callable,
+                 max_attempts: int = 8, retry_base_seconds: float = 30,
+                 retry_max_seconds: float = 3600):
+        """
+        Args:
+            directory: Folder holding queued messages ('failed/' keeps given-up ones)
+            sender_factory: Returns a new SMTPSender
+            build_message: Turns a queued record into a MIME message
+        """
+        self.directory = directory
+        self.failed_directory = os.path.join(directory, 'failed')
+        self.sender_factory = sender_factory
+        self.build_message = build_message
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+
+        self.pending = {}  # message id -> record
+        self.condition = threading.Condition()
+        self.worker = None
+        self.stopping = False
+        self.stats = {'queued': 0, 'delivered': 0, 'retried': 0, 'failed': 0, 'recovered': 0,
+                      'connections': 0}
+
+        os.makedirs(self.failed_directory, exist_ok=True)
+        self._recover()
+
+    def _path(self, message_id: str) -> str:
+        return os.path.join(self.directory, message_id + '.json')
+
+    def _save(self, record: Dict):
+        tmp_path = self._path(record['id']) + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(record, f)
+        os.replace(tmp_path, self._path(record['id']))
+
+    def _recover(self):
+        """Load messages left undelivered by an earlier run"""
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), 'r') as f:
+                    record = json.load(f)
+            except (OSError, ValueError):
+                continue
+            record['next_attempt_at'] = min(record.get('next_attempt_at', 0), time.time())
+            self.pending[record['id']] = record
+            self.stats['recovered'] += 1
+
+        if self.pending:
+            print(f"Outbox: recovered {len(self.pending)} undelivered email(s)")
+
+    def enqueue(self, subject: str, body: str, html: bool = True) -> str:
+        """Persist a message and hand it to the background worker"""
+        now = time.time()
+        record = {
+            'id': f"{now:.6f}-{uuid.uuid4().hex[:8]}",
+            'subject': subject,
+            'body': body,
+            'html': html,
+            'attempts': 0,
+            'created_at': now,
+            'next_attempt_at': now,
+            'last_error': '',
+        }
+        self._save(record)
+
+        with self.condition:
+            self.pending[record['id']] = record
+            self.stats['queued'] += 1
+            self.condition.notify_all()
+        return record['id']
+
+    def start(self):
+        """Start delivering in the background"""
+        if self.worker is not None:
+            return
+        self.stopping = False
+        self.worker = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+        self.worker.start()
+
+    def flush(self, timeout: float) -> int:
+        """
+        Wait until every queued message is delivered or the timeout passes
+
+        Returns:
+            Number of messages still queued
+        """
+        deadline = time.time() + timeout
+        with self.condition:
+            while self.pending and time.time() < deadline:
+                self.condition.wait(min(1.0, max(0.0, deadline - time.time())))
+            return len(self.pending)
+
+    def stop(self, timeout: float = 0) -> int:
+        """
+        Flush for up to `timeout` seconds, then stop the worker
+
+        Undelivered messages stay on disk for the next run.
+
+        Returns:
+            Number of messages still queued
+        """
+        remaining = self.flush(timeout) if timeout else len(self.pending)
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+        return remaining
+
+    def _next_due(self) -> Optional[Dict]:
+        """Earliest message whose retry time has come (called with the lock held)"""
+        due = [record for record in self.pending.values()
+               if record['next_attempt_at'] <= time.time()]
+        return min(due, key=lambda record: record['next_attempt_at']) if due else None
+
+    def _run(self):
+        sender = None
+        while True:
+            with self.condition:
+                record = self._next_due()
+                while record is None and not self.stopping:
+                    # Close the connection while idle instead of letting the server time it out
+                    if sender is not None:
+                        self._retire(sender)
+                        sender = None
+                    self.condition.wait(1.0)
+                    record = self._next_due()
+                if self.stopping:
+                    break
+
+            if sender is None:
+                sender = self.sender_factory()
+            self._deliver(sender, record)
+
+        if sender is not None:
+            self._retire(sender)
+
+    def _retire(self, sender):
+        """Close a sender and count the connections it opened (reconnects included)"""
+        sender.close()
+        self.stats['connections'] += sender.connections
+
+    def _deliver(self, sender, record: Dict):
+        try:
+            sender.send(self.build_message(record['subject'], record['body'], record['html']))
+        except Exception as e:
+            sender.close()
+            self._schedule_retry(record, str(e))
+            return
+
+        try:
+            os.remove(self._path(record['id']))
+        except OSError:
+            pass
+        with self.condition:
+            self.pending.pop(record['id'], None)
+            self.stats['delivered'] += 1
+            self.condition.notify_all()
+        print(f"Email sent successfully: {record['subject']}")
+
+    def _schedule_retry(self, record: Dict, error: str):
+        record['attempts'] += 1
+        record['last_error'] = error
+
+        if record['attempts'] >= self.max_attempts:
+            os.replace(self._path(record['id']), os.path.join(self.failed_directory, record['id'] + '.json'))
+            with self.condition:
+                self.pending.pop(record['id'], None)
+                self.stats['failed'] += 1
+                self.condition.notify_all()
+            print(f"Error sending email (giving up after {record['attempts']} attempts): {error}")
+            return
+
+        # Exponential backoff with jitter so retries don't line up
+        delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (record['attempts'] - 1))
+        record['next_attempt_at'] = time.time() + delay * random.uniform(0.5, 1.0)
+        self._save(record)
+
+        with self.condition:
+            self.stats['retried'] += 1
+        print(f"Error sending email, retrying in {delay:.0f}s: {error}")
@@ -0,0 +1,206 @@
+# Email Templates - Precompiled HTML templates for digest, notification and reminder emails
+
+import html
+import re
+from typing import Dict, List, Mapping
+
+
+class Template:
+    """
+    HTML template compiled once into literal chunks and {{field}} slots
+
+    Rendering appends to a list buffer, so building an email with thousands
+    of job cards stays linear. Every field value is HTML-escaped, and URL
+    fields only accept http(s) links.
+    """
+
+    FIELD_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+    def __init__(self, source: str, defaults: Mapping[str, str] = None, url_fields=('url',)):
+        self.defaults = dict(defaults or {})
+        self.url_fields = set(url_fields)
+        self.parts = []  # (literal text, field name or None)
+
+        position = 0
+        for match in self.FIELD_PATTERN.finditer(source):
+            self.parts.append((source[position:match.start()], match.group(1)))
+            position = match.end()
+        self.trailer = source[position:]
+
+    def render_into(self, buffer: List[str], values: Mapping = None):
+        """Append the rendered template to buffer"""
+        values = values or {}
+        append = buffer.append
+        escape = html.escape
+        defaults = self.defaults
+        url_fields = self.url_fields
+
+        for literal, field in self.parts:
+            append(literal)
+
+            value = values.get(field)
+            if value is None or value == '':
+                value = defaults.get(field, 'N/A')
+            value = str(value)
+            if field in url_fields and not value.lower().startswith(('http://', 'https://')):
+                value = '#'
+            append(escape(value))
+
+        append(self.trailer)
+
+    def render(self, values: Mapping = None) -> str:
+        buffer = []
+        self.render_into(buffer, values)
+        return ''.join(buffer)
+
+
+DIGEST_HEADER = Template("""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                h2 { color: #0066cc; }
+                .job-card {
+                    border: 1px solid #ddd;
+                    padding: 15px;
+                    margin: 10px 0;
+                    border-radius: 5px;
+                    background-color: #f9f9f9;
+                }
+                .job-title { font-weight: bold; font-size: 18px; color: #0066cc; }
+                .company { color: #666; font-size: 14px; }
+                .details { margin-top: 10px; }
+                .label { font-weight: bold; }
+                .reminder { background-color: #fff3cd; padding: 10px; border-left: 4px solid #ffc107; }
+                a { color: #0066cc; text-decoration: none; }
+                a:hover { text-decoration: underline; }
+            </style>
+        </head>
+        <body>
+            <h1>Your Daily Job Tracker Update</h1>
+            <p>Hello! Here's your daily summary from LinkedIn Job Tracker.</p>
+        """)
+
+DIGEST_NEW_JOBS_HEADING = Template("""
+            <h2>🆕 New Jobs Saved Today ({{count}})</h2>
+            """)
+
+DIGEST_JOB_CARD = Template("""
+                <div class="job-card">
+                    <div class="job-title">{{title}}</div>
+                    <div class="company">{{company}} - {{location}}</div>
+                    <div class="details">
+                        <p><span class="label">Experience Level:</span> {{experience_level}}</p>
+                        <p><span class="label">Job Type:</span> {{job_type}}</p>
+                        <p><span class="label">Match Score:</span> {{score}}</p>
+                        <p><span class="label">Posted:</span> {{posted_date}}</p>
+                        <p><a href="{{url}}" target="_blank">View Job Posting →</a></p>
+                    </div>
+                </div>
+                """)
+
+DIGEST_NO_JOBS = Template("<p>No new jobs saved today.</p>")
+
+DIGEST_REMINDERS_HEADING = Template("""
+            <h2>⏰ Follow-up Reminders ({{count}})</h2>
+            """)
+
+DIGEST_REMINDER = Template("""
+                <div class="reminder">
+                    <p><span class="label">Job:</span> {{title}} at {{company}}</p>
+                    <p><span class="label">Action:</span> {{reminder_reason}}</p>
+                </div>
+                """, defaults={'reminder_reason': 'Follow up required'})
+
+DIGEST_FOOTER = Template("""
+            <hr>
+            <p style="color: #666; font-size: 12px;">
+                This is an automated email from LinkedIn Job Tracker.<br>
+                To update your preferences, edit the config.py file.
+            </p>
+        </body>
+        </html>
+        """)
+
+NEW_JOBS_HEADER = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2>{{heading}}</h2>
+            <p>{{intro}}</p>
+            """)
+
+NEW_JOB_CARD = Template("""
+            <div style="border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 5px;">
+                <h3 style="color: #0066cc;">{{title}}</h3>
+                <p><strong>Company:</strong> {{company}}</p>
+                <p><strong>Location:</strong> {{location}}</p>
+                <p><strong>Experience Level:</strong> {{experience_level}}</p>
+                <p><strong>Job Type:</strong> {{job_type}}</p>
+                <p><strong>Match Score:</strong> {{score}}</p>
+                <p><strong>Posted:</strong> {{posted_date}}</p>
+                <p><a href="{{url}}" style="color: #0066cc;">View Job Posting</a></p>
+            </div>
+            """)
+
+NEW_JOBS_FOOTER = Template("""
+            <p style="margin-top: 20px;">
+                <a href="https://docs.google.com/spreadsheets" style="background-color: #0066cc; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">
+                    Open Job Tracker
+                </a>
+            </p>
+        </body>
+        </html>
+        """)
+
+REMINDER = Template("""
+        <html>
+        <body style="font-family: Arial, sans-serif;">
+            <h2 style="color: #ffc107;">⏰ Reminder</h2>
+            <p>{{message}}</p>
+
+            <div style="border-left: 4px solid #ffc107; background-color: #fff3cd; padding: 15px;">
+                <h3>{{title}}</h3>
+                <p><strong>Company:</strong> {{company}}</p>
+                <p><a href="{{url}}" style="color: #0066cc;">View Job Posting</a></p>
+            </div>
+        </body>
+        </html>
+        """)
+
+
+def render_digest(new_jobs: List[Dict], pending_followups: List[Dict] = None) -> str:
+    """HTML body of the daily digest"""
+    buffer = []
+    DIGEST_HEADER.render_into(buffer)
+
+    if new_jobs:
+        DIGEST_NEW_JOBS_HEADING.render_into(buffer, {'count': len(new_jobs)})
+        for job in new_jobs:
+            DIGEST_JOB_CARD.render_into(buffer, job)
+    else:
+        DIGEST_NO_JOBS.render_into(buffer)
+
+    if pending_followups:
+        DIGEST_REMINDERS_HEADING.render_into(buffer, {'count': len(pending_followups)})
+        for followup in pending_followups:
+            DIGEST_REMINDER.render_into(buffer, followup)
+
+    DIGEST_FOOTER.render_into(buffer)
+    return ''.join(buffer)
+
+
+def render_new_jobs(jobs: List[Dict], heading: str, intro: str) -> str:
+    """HTML body of a notification listing one or more new jobs"""
+    buffer = []
+    NEW_JOBS_HEADER.render_into(buffer, {'heading': heading, 'intro': intro})
+    for job in jobs:
+        NEW_JOB_CARD.render_into(buffer, job)
+    NEW_JOBS_FOOTER.render_into(buffer)
+    return ''.join(buffer)
+
+
+def render_reminder(message: str, job: Dict) -> str:
+    """HTML body of a follow-up or deadline reminder"""
+    values = dict(job)
+    values['message'] = message
+    return REMINDER.render(values)
@@ -0,0 +1,385 @@
+# Fake Backends - Local stand-ins for Google Sheets, SMTP and LinkedIn job pages
+# Used by benchmark_tracker.py to measure the tracker offline
+
+import base64
+import random
+import re
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import urlsplit, urlunsplit
+
+import httplib2
+from googleapiclient.errors import HttpError
+from requests.adapters import HTTPAdapter
+
+from google_sheets_manager import column_index, column_letter
+from job_urls import is_linkedin_host
+
+A1_RANGE = re.compile(r"^(?:(?P<sheet>[^!]+)!)?(?P<c1>[A-Z]+)(?P<r1>\d*)(?::(?P<c2>[A-Z]+)(?P<r2>\d*))?$")
+
+
+def _http_error(status: int, reason: str) -> HttpError:
+    return HttpError(httplib2.Response({'status': status, 'reason': reason}), reason.encode(), uri='fake://sheets')
+
+
+class _Request:
+    """Deferred call with the googleapiclient execute() interface"""
+
+    def __init__(self, service, kind: str, run):
+        self.service = service
+        self.kind = kind
+        self.run = run
+
+    def execute(self):
+        return self.service._execute(self.kind, self.run)
+
+
+class FakeSheetsService:
+    """
+    In-memory subset of the Sheets v4 API used by GoogleSheetsManager
+
+    Supports spreadsheets().create/get/batchUpdate and values().get/
+    batchGet/update/append/batchUpdate on a single worksheet, including the
+    grid row limit. Every call sleeps `latency` seconds. Like the real API,
+    reads and writes have separate quotas: calls beyond `quota_per_minute`
+    reads (or writes) in a sliding minute, and a random `error_rate` share of
+    calls, fail with HTTP 429. Drive calls (FakeDriveService) have their own,
+    much larger quota in the real API, so they only count towards `calls`.
+    """
+
+    def __init__(self, latency: float = 0.0, quota_per_minute: int = None, error_rate: float = 0.0,
+                 row_count: int = 1000, seed: int = 0):
+        self.latency = latency
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.rows = {}  # row number -> list of cell strings
+        self.row_count = row_count
+        self.sheet_title = 'Sheet1'
+        self.spreadsheet_id = 'fake-spreadsheet'
+        self.version = 1
+        self.calls = {}  # call kind -> count
+        self.quota_errors = 0
+        self._recent = {'read': deque(), 'write': deque()}  # timestamps of calls in the last minute
+
+    # Resource accessors, mirroring the discovery-built client
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return _FakeValues(self)
+
+    def _execute(self, kind: str, run):
+        if self.latency:
+            time.sleep(self.latency)
+        with self.lock:
+            self.calls[kind] = self.calls.get(kind, 0) + 1
+            if kind.startswith('drive.'):
+                return run()
+
+            quota = 'read' if kind.split('.')[-1] in ('get', 'batchGet') else 'write'
+            recent = self._recent[quota]
+            now = time.monotonic()
+            while recent and now - recent[0] >= 60:
+                recent.popleft()
+            over_quota = self.quota_per_minute is not None and len(recent) >= self.quota_per_minute
+            if over_quota or (self.error_rate and self.random.random() < self.error_rate):
+                self.quota_errors += 1
+                raise _http_error(429, f'Quota exceeded for quota metric {quota.title()} requests per minute')
+            recent.append(now)
+            return run()
+
+    # spreadsheets()
+    def create(self, body: Dict, fields: str = None):
+        def run():
+            self.sheet_title = body['sheets'][0]['properties'].get('title', 'Sheet1')
+            return {'spreadsheetId': self.spreadsheet_id, 'sheets': [{'properties': {'sheetId': 0}}]}
+        return _Request(self, 'create', run)
+
+    def get(self, spreadsheetId: str, fields: str = None):
+        def run():
+            return {'sheets': [{'properties': {
+                'sheetId': 0,
+                'title': self.sheet_title,
+                'gridProperties': {'rowCount': self.row_count},
+            }}]}
+        return _Request(self, 'get', run)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict):
+        def run():
+            for request in body.get('requests', []):
+                if 'appendDimension' in request:
+                    self.row_count += request['appendDimension']['length']
+            self.version += 1
+            return {}
+        return _Request(self, 'batchUpdate', run)
+
+    # Cell storage
+    def _parse(self, a1: str):
+        match = A1_RANGE.match(a1)
+        if not match:
+            raise _http_error(400, f'Unable to parse range: {a1}')
+        if match.group('sheet'):
+            self.sheet_title = match.group('sheet').strip("'")
+        first_column = column_index(match.group('c1'))
+        last_column = column_index(match.group('c2') or match.group('c1'))
+        first_row = int(match.group('r1') or 1)
+        last_row = int(match.group('r2')) if match.group('r2') else None
+        return first_column, last_column, first_row, last_row
+
+    def _last_row(self) -> int:
+        return max((row for row, cells in self.rows.items() if any(cells)), default=0)
+
+    def _read(self, a1: str) -> List[List[str]]:
+        first_column, last_column, first_row, last_row = self._parse(a1)
+        last_row = min(last_row or self._last_row(), self._last_row())
+        values = []
+        for row in range(first_row, last_row + 1):
+            cells = self.rows.get(row, [])[first_column:last_column + 1]
+            while cells and cells[-1] == '':
+                cells = cells[:-1]
+            values.append(cells)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _write(self, a1: str, values: List[List]) -> str:
+        first_column, _, first_row, _ = self._parse(a1)
+        last_row = first_row + len(values) - 1
+        if last_row > self.row_count:
+            raise _http_error(400, f'Range ({a1}) exceeds grid limits. Max rows: {self.row_count}')
+        width = 0
+        for offset, row_values in enumerate(values):
+            cells = self.rows.setdefault(first_row + offset, [])
+            end = first_column + len(row_values)
+            if len(cells) < end:
+                cells.extend([''] * (end - len(cells)))
+            cells[first_column:end] = ['' if value is None else str(value) for value in row_values]
+            width = max(width, len(row_values))
+        self.version += 1
+        last_column = column_letter(first_column + max(width, 1) - 1)
+        return f"{self.sheet_title}!{column_letter(first_column)}{first_row}:{last_column}{last_row}"
+
+
+class _FakeValues:
+    """spreadsheets().values() of FakeSheetsService"""
+
+    def __init__(self, service: FakeSheetsService):
+        self.service = service
+
+    def get(self, spreadsheetId: str, range: str):
+        return _Request(self.service, 'values.get', lambda: {'range': range, 'values': self.service._read(range)})
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str]):
+        return _Request(self.service, 'values.batchGet', lambda: {
+            'valueRanges': [{'range': a1, 'values': self.service._read(a1)} for a1 in ranges]
+        })
+
+    def update(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict):
+        return _Request(self.service, 'values.update', lambda: {
+            'updatedRange': self.service._write(range, body['values'])
+        })
+
+    def append(self, spreadsheetId: str, range: str, valueInputOption: str, body: Dict):
+        def run():
+            first_column = self.service._parse(range)[0]
+            start = f"{column_letter(first_column)}{self.service._last_row() + 1}"
+            updated = self.service._write(start, body['values'])
+            return {'updates': {'updatedRange': updated, 'updatedRows': len(body['values'])}}
+        return _Request(self.service, 'values.append', run)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict):
+        def run():
+            for block in body['data']:
+                self.service._write(block['range'], block['values'])
+            return {'totalUpdatedCells': sum(len(row) for block in body['data'] for row in block['values'])}
+        return _Request(self.service, 'values.batchUpdate', run)
+
+
+class FakeDriveService:
+    """files().get(fields='version') for a FakeSheetsService, so the replica sees revisions"""
+
+    def __init__(self, sheets: FakeSheetsService):
+        self.sheets = sheets
+
+    def files(self):
+        return self
+
+    def get(self, fileId: str, fields: str = None):
+        return _Request(self.sheets, 'drive.files.get', lambda: {'version': str(self.sheets.version)})
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT"""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        sink = self.server.sink
+        self.reply('220 smtp-sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip()
+            verb = command[:4].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250-smtp-sink')
+                self.reply('250-AUTH PLAIN LOGIN')
+                self.reply('250 SIZE 52428800')
+            elif verb == 'AUTH':
+                if command.upper().startswith('AUTH LOGIN'):
+                    self.reply('334 ' + base64.b64encode(b'Username:').decode())
+                    self.rfile.readline()
+                    self.reply('334 ' + base64.b64encode(b'Password:').decode())
+                    self.rfile.readline()
+                self.reply('235 2.7.0 Authentication successful')
+            elif verb in ('MAIL', 'RCPT', 'RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(data_line)
+                if sink.latency:
+                    time.sleep(sink.latency)
+                sink.received(b''.join(data))
+                self.reply('250 OK queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+class SMTPSink:
+    """
+    Local SMTP server that accepts every message and keeps count
+
+    Point EMAIL_CONFIG at it with use_tls False:
+        smtp_server='127.0.0.1', smtp_port=sink.port
+    """
+
+    def __init__(self, latency: float = 0.0, keep_messages: bool = False):
+        self.latency = latency
+        self.keep_messages = keep_messages
+        self.messages = []
+        self.count = 0
+        self.bytes = 0
+        self.lock = threading.Lock()
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self.server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPHandler)
+        self.server.daemon_threads = True
+        self.server.sink = self
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def received(self, message: bytes):
+        with self.lock:
+            self.count += 1
+            self.bytes += len(message)
+            if self.keep_messages:
+                self.messages.append(message)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like LinkedIn
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.fixtures
+        match = re.search(r'/jobs/view/(\d+)', self.path)
+        if not match:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if server.latency:
+            time.sleep(server.latency)
+        job_id = int(match.group(1))
+        index = job_id % len(server.pages)
+        etag = f'"{job_id}-{index}"'
+        server.requests += 1
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        body = server.pages[index]
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # streaming extraction hangs up once it has every field
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # clients that hang up early (streaming extraction) are expected
+
+
+class FixtureServer:
+    """Serves saved job pages for any /jobs/view/<id>/ URL"""
+
+    def __init__(self, page_paths: List[str], latency: float = 0.0):
+        self.pages = []
+        for path in page_paths:
+            with open(path, 'rb') as f:
+                self.pages.append(f.read())
+        self.latency = latency
+        self.requests = 0
+        self.server = _QuietHTTPServer(('127.0.0.1', 0), _FixtureHandler)
+        self.server.fixtures = self
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def install(self, session):
+        """Send a requests session's linkedin.com traffic to this server instead"""
+        current = session.get_adapter('https://')
+        adapter = FixtureAdapter(self.base_url, pool_connections=current._pool_connections,
+                                 pool_maxsize=current._pool_maxsize, max_retries=current.max_retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FixtureAdapter(HTTPAdapter):
+    """Transport adapter that rewrites linkedin.com URLs to a FixtureServer"""
+
+    def __init__(self, base_url: str, **kwargs):
+        self.base = urlsplit(base_url)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        if is_linkedin_host(parts.hostname):
+            request.url = urlunsplit((self.base.scheme, self.base.netloc, parts.path, parts.query, ''))
+        return super().send(request, **kwargs)
@@ -2,30 +2,118 @@
 
 import os.path
 import pickle
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+import hashlib
+import json
+import re
+import time
+from bisect import bisect_left
+from datetime import timedelta
 from googleapiclient.errors import HttpError
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from sheet_replica import SheetReplica
+from job_urls import canonical_job_url
+from instrumentation import metrics
+from sheets_scheduler import SheetsRequestScheduler
 import config
 
 
-SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    # Lets the local replica check the sheet's revision without downloading it
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+]
+
+HEADERS = [
+    'Job Title', 'Company', 'Location', 'Job Type', 'Experience Level',
+    'Posted Date', 'URL', 'Description', 'Status', 'Application Date',
+    'Follow-up Date', 'Notes', 'Extracted Date', 'Score', 'Duplicate Of'
+]
+
+# Job dictionary key for each column, in sheet order
+JOB_FIELDS = [
+    'title', 'company', 'location', 'job_type', 'experience_level',
+    'posted_date', 'url', 'description', 'status', 'application_date',
+    'follow_up_date', 'notes', 'extracted_date', 'score', 'duplicate_of'
+]
+
+# Columns filled by the extractor; the rest are edited by the user and are
+# left alone when an existing job is updated
+EXTRACTED_FIELDS = JOB_FIELDS[:JOB_FIELDS.index('description') + 1]
+
+# Columns the tracker computes from the extracted ones. They come last, so
+# sheets created before a column existed keep their layout, and they are
+# rewritten together with the extracted columns.
+COMPUTED_FIELDS = ['score', 'duplicate_of']
+COMPUTED_COLUMN = JOB_FIELDS.index(COMPUTED_FIELDS[0])
+
+URL_COLUMN = JOB_FIELDS.index('url')
+
+
+def column_letter(index: int) -> str:
+    """Convert a zero-based column index to its A1 letter (0 -> A, 26 -> AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    """Convert an A1 column letter to its zero-based index (A -> 0, AA -> 26)"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+LAST_COLUMN = column_letter(len(HEADERS) - 1)
+
+A1_BLOCK = re.compile(r'!([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$')
 
 
 class GoogleSheetsManager:
     """Manages Google Sheets operations for job tracking"""
 
-    def __init__(self):
+    def __init__(self, service=None, drive_service=None, replica_path: str = None):
+        """
+        Args:
+            service: Ready Sheets API client (e.g. fake_backends.FakeSheetsService);
+                     by default one is built with OAuth on first use
+            drive_service: Ready Drive API client used for revision checks
+            replica_path: SQLite file of the local copy (default: REPLICA_CONFIG['path'])
+        """
         self.creds = None
-        self.service = None
+        self._service = service  # built on first use, see the service property
+        self.timings = {}  # startup step -> milliseconds
         self.spreadsheet_id = None
-        self._authenticate()
+        self.url_index = None  # job URL -> sheet row number, loaded on first upsert
+        self.index_revision = None  # sheet revision the url_index matches (None: unknown)
+        self.row_fingerprints = {}  # row number -> hash of the extracted and computed cells in the sheet
+        self.next_row = None
+        self.grid_rows = None
+        self.drive_service = drive_service
+        self.scheduler = SheetsRequestScheduler(config.SHEETS_QUOTA_CONFIG)  # every API call goes through it
+        self.replica = None
+        if config.REPLICA_CONFIG['enabled']:
+            self.replica = SheetReplica(replica_path or config.REPLICA_CONFIG['path'], JOB_FIELDS)
+
+    @property
+    def service(self):
+        """Sheets API client, authenticated and built the first time it is needed"""
+        if self._service is None:
+            self._authenticate()
+        return self._service
 
     def _authenticate(self):
         """Authenticate with Google Sheets API"""
+        # Imported here so commands that never touch Sheets skip the cost
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
+        started = time.perf_counter()
+
         # Token file stores user's access and refresh tokens
         if os.path.exists(config.TOKEN_FILE):
             with open(config.TOKEN_FILE, 'rb') as token:
@@ -44,11 +132,45 @@ class GoogleSheetsManager:
             with open(config.TOKEN_FILE, 'wb') as token:
                 pickle.dump(self.creds, token)
 
+        self.timings['auth'] = (time.perf_counter() - started) * 1000
+
         try:
-            self.service = build('sheets', 'v4', credentials=self.creds)
+            self._service = self._build_client('sheets', 'v4')
         except HttpError as error:
             print(f'An error occurred: {error}')
 
+    def _build_client(self, api: str, version: str):
+        """
+        Build a Google API client from a locally cached discovery document
+
+        The document is written to DISCOVERY_CACHE_DIR the first time an API
+        is used, so later runs never fetch or search for it.
+        """
+        from googleapiclient.discovery import build, build_from_document
+
+        started = time.perf_counter()
+        cache_path = os.path.join(config.DISCOVERY_CACHE_DIR, f"{api}.{version}.json")
+
+        if os.path.exists(cache_path):
+            with open(cache_path, 'r') as f:
+                client = build_from_document(f.read(), credentials=self.creds)
+        else:
+            client = build(api, version, credentials=self.creds)
+            try:
+                os.makedirs(config.DISCOVERY_CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'w') as f:
+                    json.dump(client._rootDesc, f)
+            except OSError:
+                pass  # caching is only an optimization
+
+        self.timings[f'build {api}'] = (time.perf_counter() - started) * 1000
+        return client
+
+    def _execute(self, request, name: str, idempotent: bool = None):
+        """Run a Google API request through the quota scheduler (paced, retried when throttled)"""
+        metrics.count('sheets_calls')
+        return self.scheduler.execute(request, name, idempotent)
+
     def create_spreadsheet(self):
         """Create a new spreadsheet for job tracking"""
         try:
@@ -63,10 +185,10 @@ class GoogleSheetsManager:
                 }]
             }
 
-            spreadsheet = self.service.spreadsheets().create(
+            spreadsheet = self._execute(self.service.spreadsheets().create(
                 body=spreadsheet,
                 fields='spreadsheetId,sheets.properties.sheetId'
-            ).execute()
+            ), 'spreadsheets.create')
 
             self.spreadsheet_id = spreadsheet.get('spreadsheetId')
             self.sheet_id = spreadsheet.get('sheets')[0].get('properties').get('sheetId')
@@ -81,30 +203,28 @@ class GoogleSheetsManager:
             print(f'An error occurred: {error}')
             return None
 
+    def _range(self, a1_range: str) -> str:
+        """Prefix an A1 range with the worksheet name"""
+        return f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!{a1_range}"
+
     def _setup_headers(self):
         """Set up column headers in the spreadsheet"""
-        headers = [
-            'Job Title', 'Company', 'Location', 'Job Type', 'Experience Level',
-            'Posted Date', 'URL', 'Description', 'Status', 'Application Date',
-            'Follow-up Date', 'Notes', 'Extracted Date'
-        ]
-
         try:
             body = {
-                'values': [headers]
+                'values': [HEADERS]
             }
 
-            self.service.spreadsheets().values().update(
+            self._execute(self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!A1:M1",
+                range=self._range(f"A1:{LAST_COLUMN}1"),
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ), 'values.update')
 
             # Format headers (bold, freeze row)
             # Get sheet ID if not already set
             if not hasattr(self, 'sheet_id'):
-                sheet_metadata = self.service.spreadsheets().get(spreadsheetId=self.spreadsheet_id).execute()
+                sheet_metadata = self._execute(self.service.spreadsheets().get(spreadsheetId=self.spreadsheet_id), 'spreadsheets.get')
                 self.sheet_id = sheet_metadata.get('sheets')[0].get('properties').get('sheetId')
 
             requests = [
@@ -140,10 +260,10 @@ class GoogleSheetsManager:
             ]
 
             body = {'requests': requests}
-            self.service.spreadsheets().batchUpdate(
+            self._execute(self.service.spreadsheets().batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
                 body=body
-            ).execute()
+            ), 'spreadsheets.batchUpdate')
 
             print("Headers set up successfully!")
 
@@ -157,54 +277,258 @@ class GoogleSheetsManager:
             return
 
         try:
-            values = []
-            for job in jobs_data:
-                row = [
-                    job.get('title', ''),
-                    job.get('company', ''),
-                    job.get('location', ''),
-                    job.get('job_type', ''),
-                    job.get('experience_level', ''),
-                    job.get('posted_date', ''),
-                    job.get('url', ''),
-                    job.get('description', ''),
-                    job.get('status', 'Saved'),
-                    job.get('application_date', ''),
-                    job.get('follow_up_date', ''),
-                    job.get('notes', ''),
-                    job.get('extracted_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
-                ]
-                values.append(row)
+            values = [self._job_to_row(job) for job in jobs_data]
 
             body = {'values': values}
 
-            result = self.service.spreadsheets().values().append(
+            replica_current = self._replica_is_current()
+            result = self._execute(self.service.spreadsheets().values().append(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!A:M",
+                range=self._range(f"A:{LAST_COLUMN}"),
                 valueInputOption='RAW',
                 body=body
-            ).execute()
+            ), 'values.append')
+
+            # Row positions of the appended jobs are unknown, so rebuild the index on next upsert
+            self.url_index = None
+            self._write_through([{'range': result['updates']['updatedRange'], 'values': values}],
+                                replica_current)
 
             print(f"{result.get('updates').get('updatedRows')} rows added to spreadsheet")
 
         except HttpError as error:
             print(f'An error occurred: {error}')
 
+    @staticmethod
+    def _job_to_row(job: Dict) -> List:
+        """Convert a job dictionary to a sheet row in column order"""
+        row = [job.get(field, '') for field in JOB_FIELDS]
+        row[JOB_FIELDS.index('status')] = job.get('status', 'Saved')
+        row[JOB_FIELDS.index('extracted_date')] = job.get(
+            'extracted_date', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        return row
+
+    @staticmethod
+    def _tracked_cells(row: List) -> List:
+        """The extracted and computed cells of a row (Sheets omits trailing empty cells, so pad first)"""
+        row = list(row) + [''] * (len(JOB_FIELDS) - len(row))
+        return row[:len(EXTRACTED_FIELDS)] + row[COMPUTED_COLUMN:len(JOB_FIELDS)]
+
+    @staticmethod
+    def _fingerprint(values: List) -> str:
+        # None is written as an empty cell, so hash it like one
+        text = '\x1f'.join('' if value is None else str(value) for value in values)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _load_url_index(self):
+        """
+        Map every (canonical) job URL to its row number, fingerprint what
+        each row holds and find the first free row
+
+        The whole table is used rather than just the URL column, so rows the
+        user typed in without a URL are never taken for free rows. When the
+        local replica matches the sheet's revision the rows come from it and
+        only the header row is downloaded.
+        """
+        # Read before the table, so an edit made in between shows up as a newer revision
+        self.index_revision = self._get_revision()
+        if self.replica:
+            self.sync_replica()
+
+        if self._replica_is_current(self.index_revision):
+            result = self._execute(self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=self._range(f"A1:{LAST_COLUMN}1")
+            ), 'values.get')
+            header_row = (result.get('values') or [[]])[0]
+            rows = [(job['row_number'], [job[field] for field in JOB_FIELDS])
+                    for job in self.replica.query(JOB_FIELDS)]
+        else:
+            result = self._execute(self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=self._range(f"A1:{LAST_COLUMN}")
+            ), 'values.get')
+            values = result.get('values', [])
+            header_row = values[0] if values else []
+            rows = [(offset + 2, row) for offset, row in enumerate(values[1:])]
+        self._add_missing_headers(header_row)
+
+        self.url_index = {}
+        self.row_fingerprints = {}
+        for row_number, row in rows:
+            url = row[URL_COLUMN] if len(row) > URL_COLUMN else ''
+            if url:
+                self.url_index[canonical_job_url(url)] = row_number
+                self.row_fingerprints[row_number] = self._fingerprint(self._tracked_cells(row))
+        # Sheets leaves out trailing empty rows, so the table ends at the last row with any value
+        self.next_row = max((row_number for row_number, row in rows if any(row)), default=1) + 1
+
+        sheet = self._get_sheet_properties()
+        self.sheet_id = sheet['sheetId']
+        self.grid_rows = sheet['gridProperties']['rowCount']
+
+    def _add_missing_headers(self, header_row: List[str]):
+        """Name the columns added since the sheet was created (e.g. Score, Duplicate Of)"""
+        if not header_row or len(header_row) >= len(HEADERS) or header_row != HEADERS[:len(header_row)]:
+            return  # empty, current, or renamed by the user
+        first = len(header_row)
+        self._execute(self.service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=self._range(f"{column_letter(first)}1:{LAST_COLUMN}1"),
+            valueInputOption='RAW',
+            body={'values': [HEADERS[first:]]}
+        ), 'values.update')
+        print(f"Added column(s) {', '.join(HEADERS[first:])} to the spreadsheet")
+
+    def _get_sheet_properties(self) -> Dict:
+        """Return the properties of the jobs worksheet"""
+        metadata = self._execute(self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            fields='sheets.properties'
+        ), 'spreadsheets.get')
+
+        for sheet in metadata.get('sheets', []):
+            if sheet['properties']['title'] == config.GOOGLE_SHEETS_CONFIG['worksheet_name']:
+                return sheet['properties']
+        return metadata['sheets'][0]['properties']
+
+    def upsert_jobs(self, jobs_data: List[Dict]) -> bool:
+        """
+        Add new jobs and update existing ones, keyed by job URL
+
+        The tracker's seen-jobs check keeps known URLs out of --process, so
+        existing rows are updated by --refresh (and by resumed batches).
+        Existing rows only get their extracted and computed columns rewritten,
+        and only when they differ from what the sheet held when the index was
+        loaded (or from our last write), so status, dates and notes entered
+        by the user are kept.
+        All writes go out in a single values().batchUpdate call. The index
+        only learns the new rows and fingerprints once that call succeeds,
+        so jobs from a failed write are written again on the next attempt.
+
+        Returns:
+            True if the spreadsheet now holds every job
+        """
+        if not self.spreadsheet_id:
+            print("No spreadsheet ID set. Please create or set a spreadsheet first.")
+            return False
+
+        try:
+            if self.url_index is None:
+                self._load_url_index()
+
+            data = []
+            new_index = {}  # merged into url_index / row_fingerprints after the write succeeds
+            fingerprints = {}
+            new_rows = []
+            updated = 0
+            first_new_row = self.next_row
+            last_extracted = column_letter(len(EXTRACTED_FIELDS) - 1)
+
+            for job in jobs_data:
+                row = self._job_to_row(job)
+                extracted = row[:len(EXTRACTED_FIELDS)]
+                computed = row[COMPUTED_COLUMN:]
+                fingerprint = self._fingerprint(self._tracked_cells(row))
+                url = canonical_job_url(job.get('url', ''))
+                row_number = self.url_index.get(url) or new_index.get(url)
+
+                if row_number is None:
+                    row_number = first_new_row + len(new_rows)
+                    new_index[url] = row_number
+                    new_rows.append(row)
+                elif fingerprints.get(row_number, self.row_fingerprints.get(row_number)) != fingerprint:
+                    if row_number >= first_new_row:
+                        # Same URL twice in this batch - the new row is still pending
+                        pending = new_rows[row_number - first_new_row]
+                        pending[:len(extracted)] = extracted
+                        pending[COMPUTED_COLUMN:] = computed
+                    else:
+                        data.append({
+                            'range': self._range(f"A{row_number}:{last_extracted}{row_number}"),
+                            'values': [extracted]
+                        })
+                        data.append({
+                            'range': self._range(f"{column_letter(COMPUTED_COLUMN)}{row_number}:"
+                                                 f"{LAST_COLUMN}{row_number}"),
+                            'values': [computed]
+                        })
+                        updated += 1
+                fingerprints[row_number] = fingerprint
+
+            if new_rows:
+                last_row = first_new_row + len(new_rows) - 1
+                data.append({
+                    'range': self._range(f"A{first_new_row}:{LAST_COLUMN}{last_row}"),
+                    'values': new_rows
+                })
+                self._ensure_grid_rows(last_row)
+
+            if not data:
+                print("All jobs already up to date in spreadsheet")
+                return True
+
+            revision = self._get_revision()
+            replica_current = self._replica_is_current(revision)
+            index_current = revision is not None and revision == self.index_revision
+            self._execute(self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'RAW', 'data': data}
+            ), 'values.batchUpdate')
+
+            self.url_index.update(new_index)
+            self.row_fingerprints.update(fingerprints)
+            self.next_row = first_new_row + len(new_rows)
+            new_revision = self._write_through(data, replica_current)
+            # Our own write keeps the index valid only if nobody else changed the sheet before it
+            self.index_revision = (new_revision or self._get_revision()) if index_current else None
+            print(f"{len(new_rows)} rows added, {updated} rows updated in spreadsheet")
+            return True
+
+        except HttpError as error:
+            # The index may no longer match the sheet after a partial failure
+            self.url_index = None
+            print(f'An error occurred: {error}')
+            return False
+
+    def _ensure_grid_rows(self, last_row: int):
+        """values().batchUpdate cannot write past the grid, so grow it first if needed"""
+        if last_row <= self.grid_rows:
+            return
+
+        extra_rows = max(last_row - self.grid_rows, 500)
+        self._execute(self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'requests': [{
+                'appendDimension': {
+                    'sheetId': self.sheet_id,
+                    'dimension': 'ROWS',
+                    'length': extra_rows
+                }
+            }]}
+        ), 'spreadsheets.batchUpdate', idempotent=False)
+        self.grid_rows += extra_rows
+
     def set_spreadsheet_id(self, spreadsheet_id: str):
         """Set the spreadsheet ID to use"""
         self.spreadsheet_id = spreadsheet_id
+        self.url_index = None
 
     def get_all_jobs(self) -> List[List]:
-        """Retrieve all jobs from the spreadsheet"""
+        """Retrieve all jobs from the spreadsheet (served from the local replica when enabled)"""
         if not self.spreadsheet_id:
             print("No spreadsheet ID set.")
             return []
 
+        if self.replica:
+            self.sync_replica()
+            return self.replica.all_rows()
+
         try:
-            result = self.service.spreadsheets().values().get(
+            result = self._execute(self.service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!A2:M"
-            ).execute()
+                range=self._range(f"A2:{LAST_COLUMN}")
+            ), 'values.get')
 
             values = result.get('values', [])
             return values
@@ -213,40 +537,349 @@ class GoogleSheetsManager:
             print(f'An error occurred: {error}')
             return []
 
-    def update_job_status(self, row_number: int, status: str, notes: str = ""):
-        """Update the status of a specific job"""
+    def get_jobs_extracted_on(self, day: str, fields: List[str] = None) -> List[Dict]:
+        """
+        Jobs added to the tracker on a given day
+
+        Args:
+            day: Date as YYYY-MM-DD
+            fields: Job fields to return (all by default)
+        """
+        next_day = (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        return self.query_jobs(fields, start=day, end=next_day)
+
+    def query_jobs(self, fields: List[str] = None, start: str = None, end: str = None) -> List[Dict]:
+        """
+        Read selected columns of the jobs extracted in a date window
+
+        Without the replica, only the Extracted Date column is downloaded in
+        full. Rows are appended in date order, so the window's first and last
+        rows are found by binary search, and only the requested columns of
+        those rows are fetched in one batchGet call.
+
+        Args:
+            fields: Job fields (see JOB_FIELDS) to return; all by default
+            start: Earliest extracted date, inclusive ('YYYY-MM-DD' or a full timestamp)
+            end: Latest extracted date, exclusive
+
+        Returns:
+            List of job dictionaries with the requested fields plus 'row_number'
+        """
+        fields = fields or JOB_FIELDS
+
         if not self.spreadsheet_id:
             print("No spreadsheet ID set.")
+            return []
+
+        if self.replica:
+            self.sync_replica()
+            return self.replica.query(fields, start, end)
+
+        try:
+            first_row, last_row = self._find_date_window(start, end)
+            if first_row > last_row:
+                return []
+
+            # One range per run of adjacent requested columns
+            columns = sorted({JOB_FIELDS.index(field) for field in fields})
+            runs = []
+            for column in columns:
+                if runs and runs[-1][1] == column - 1:
+                    runs[-1][1] = column
+                else:
+                    runs.append([column, column])
+
+            result = self._execute(self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=[self._range(f"{column_letter(first)}{first_row}:{column_letter(last)}{last_row}")
+                        for first, last in runs]
+            ), 'values.batchGet')
+
+            jobs = [{'row_number': row_number} for row_number in range(first_row, last_row + 1)]
+            for (first, last), value_range in zip(runs, result.get('valueRanges', [])):
+                rows = value_range.get('values', [])
+                for offset, job in enumerate(jobs):
+                    row = rows[offset] if offset < len(rows) else []
+                    for column in range(first, last + 1):
+                        cell = column - first
+                        job[JOB_FIELDS[column]] = row[cell] if cell < len(row) else ''
+
+            return [{key: job[key] for key in ['row_number'] + list(fields)} for job in jobs]
+
+        except HttpError as error:
+            print(f'An error occurred: {error}')
+            return []
+
+    def _find_date_window(self, start: str = None, end: str = None) -> Tuple[int, int]:
+        """
+        Sheet rows (first, last) whose Extracted Date lies in [start, end)
+
+        Returns a window with first > last when no rows match.
+        """
+        date_column = column_letter(JOB_FIELDS.index('extracted_date'))
+        result = self._execute(self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=self._range(f"{date_column}2:{date_column}")
+        ), 'values.get')
+
+        # Carry the previous date over blank cells so the column stays sorted
+        dates = []
+        previous = ''
+        for row in result.get('values', []):
+            previous = row[0] if row and row[0] else previous
+            dates.append(previous)
+
+        low = bisect_left(dates, start) if start else 0
+        high = bisect_left(dates, end) if end else len(dates)
+        return low + 2, high + 1
+
+    def data_revision(self) -> Optional[str]:
+        """
+        Revision of the sheet data served by the replica
+
+        Lets callers skip rebuilding anything derived from the sheet when it
+        hasn't changed. None means unknown (no replica or no Drive scope).
+        """
+        if not self.replica or not self.spreadsheet_id:
+            return None
+        self.sync_replica()
+        return self.replica.get_meta('revision') or None
+
+    def _get_revision(self) -> Optional[str]:
+        """
+        Current revision number of the spreadsheet (from the Drive API)
+
+        Returns None when it cannot be read, e.g. for tokens granted before
+        the Drive metadata scope was added.
+        """
+        try:
+            if self.drive_service is None:
+                if self._service is None:
+                    self._authenticate()
+                self.drive_service = self._build_client('drive', 'v3')
+            result = self._execute(self.drive_service.files().get(
+                fileId=self.spreadsheet_id, fields='version'
+            ), 'files.get')
+            return str(result.get('version'))
+        except HttpError:
+            return None
+
+    def sync_replica(self, force: bool = False):
+        """
+        Bring the local replica up to date
+
+        The sheet is only downloaded again when its revision differs from the
+        one the replica was built from. If the revision cannot be read, the
+        replica is refreshed once it is older than max_staleness_minutes.
+        """
+        if not self.replica or not self.spreadsheet_id:
             return
 
+        same_sheet = self.replica.get_meta('spreadsheet_id') == self.spreadsheet_id
+        revision = self._get_revision()
+
+        if same_sheet and not force:
+            if revision is not None and revision == self.replica.get_meta('revision'):
+                return
+            if revision is None:
+                synced_at = float(self.replica.get_meta('synced_at') or 0)
+                if time.time() - synced_at < config.REPLICA_CONFIG['max_staleness_minutes'] * 60:
+                    return
+
         try:
-            # Update status (column I, index 9)
-            status_range = f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!I{row_number}"
-            body = {'values': [[status]]}
+            result = self._execute(self.service.spreadsheets().values().get(
+                spreadsheetId=self.spreadsheet_id,
+                range=self._range(f"A2:{LAST_COLUMN}")
+            ), 'values.get')
+        except HttpError as error:
+            print(f'An error occurred: {error}')
+            return
 
-            self.service.spreadsheets().values().update(
+        self.replica.replace_all(result.get('values', []))
+        self.replica.set_meta('spreadsheet_id', self.spreadsheet_id)
+        self.replica.set_meta('revision', revision or '')
+        self.replica.set_meta('synced_at', time.time())
+
+    def _replica_is_current(self, revision: str = None) -> bool:
+        """
+        True if the replica matches the sheet's revision right now (checked before our own writes)
+
+        Args:
+            revision: The sheet's current revision, if the caller already read it
+        """
+        if not self.replica or self.replica.get_meta('spreadsheet_id') != self.spreadsheet_id:
+            return False
+        stored = self.replica.get_meta('revision')
+        if revision is None:
+            revision = self._get_revision()
+        return bool(stored) and revision == stored
+
+    def drop_stale_url_index(self):
+        """
+        Forget the URL index if the sheet changed since it was loaded
+
+        Rows the user inserted or deleted move jobs to other row numbers, so
+        a long-running process calls this before each upsert; the index is
+        then reloaded from the sheet. If the revision can't be read, the
+        index is always reloaded.
+        """
+        if self.url_index is None:
+            return
+        revision = self._get_revision()
+        if revision is None or revision != self.index_revision:
+            self.url_index = None
+
+    def _write_through(self, data: List[Dict], replica_current: bool) -> Optional[str]:
+        """
+        Apply our own successful writes to the replica
+
+        If the replica matched the sheet just before the write, it is tagged
+        with the sheet's new revision, so our writes alone never force a full
+        download. Otherwise the sheet holds edits the replica hasn't seen, and
+        taking the new revision would hide them; the stored revision is
+        cleared instead so the next read downloads the sheet.
+
+        Args:
+            data: The value ranges that were written
+            replica_current: Result of _replica_is_current() taken before the write
+
+        Returns:
+            The sheet's revision after the write, if it was read
+        """
+        if not self.replica or self.replica.get_meta('spreadsheet_id') != self.spreadsheet_id:
+            return None
+
+        for block in data:
+            match = A1_BLOCK.search(block['range'])
+            if not match:
+                continue
+            self.replica.write_cells(int(match.group(2)), column_index(match.group(1)), block['values'])
+
+        if not replica_current:
+            self.replica.set_meta('revision', '')
+            return None
+
+        revision = self._get_revision()
+        if revision is not None:
+            self.replica.set_meta('revision', revision)
+        self.replica.set_meta('synced_at', time.time())
+        return revision
+
+    def update_job_status(self, row_number: int, status: str, notes: str = ""):
+        """Update the status of a specific job"""
+        self.update_job_statuses([(row_number, status, notes or None, None, None)])
+
+    def update_job_statuses(self, updates: List[Tuple[int, Optional[str], Optional[str],
+                                                      Optional[str], Optional[str]]]) -> Optional[Dict]:
+        """
+        Update status, notes and dates of many jobs in a single API call
+
+        Args:
+            updates: (row_number, status, notes, application_date, follow_up_date)
+                tuples. None leaves that cell unchanged; a later tuple for the
+                same row overrides earlier values.
+
+        Returns:
+            Dictionary with the number of cells, ranges and API calls saved,
+            or None if nothing was written
+        """
+        if not self.spreadsheet_id:
+            print("No spreadsheet ID set.")
+            return None
+
+        # Collect the cells to write per row, keyed by column index
+        cells_by_row = {}
+        for row_number, status, notes, application_date, follow_up_date in updates:
+            cells = cells_by_row.setdefault(row_number, {})
+            for field, value in (('status', status), ('notes', notes),
+                                 ('application_date', application_date),
+                                 ('follow_up_date', follow_up_date)):
+                if value is not None:
+                    cells[JOB_FIELDS.index(field)] = value
+
+        data = self._coalesce_ranges(cells_by_row)
+        if not data:
+            return None
+
+        cell_count = sum(len(cells) for cells in cells_by_row.values())
+
+        try:
+            replica_current = self._replica_is_current()
+            self._execute(self.service.spreadsheets().values().batchUpdate(
                 spreadsheetId=self.spreadsheet_id,
-                range=status_range,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+                body={'valueInputOption': 'RAW', 'data': data}
+            ), 'values.batchUpdate')
+            self._write_through(data, replica_current)
 
-            # Update notes if provided (column L, index 12)
-            if notes:
-                notes_range = f"{config.GOOGLE_SHEETS_CONFIG['worksheet_name']}!L{row_number}"
-                body = {'values': [[notes]]}
+            # Updating one cell per call would have cost cell_count calls
+            summary = {'cells': cell_count, 'ranges': len(data),
+                       'api_calls': 1, 'calls_saved': cell_count - 1}
+            print(f"{len(cells_by_row)} rows updated successfully "
+                  f"({cell_count} cells in {len(data)} ranges, {summary['calls_saved']} API calls saved)")
+            return summary
 
-                self.service.spreadsheets().values().update(
-                    spreadsheetId=self.spreadsheet_id,
-                    range=notes_range,
-                    valueInputOption='RAW',
-                    body=body
-                ).execute()
+        except HttpError as error:
+            print(f'An error occurred: {error}')
+            return None
 
-            print(f"Row {row_number} updated successfully")
+    def update_job_scores(self, scores: Dict[int, int]) -> bool:
+        """Write the Score column of many rows (row number -> score) in one call"""
+        if not self.spreadsheet_id or not scores:
+            return False
+
+        score_column = JOB_FIELDS.index('score')
+        data = self._coalesce_ranges({row_number: {score_column: score}
+                                      for row_number, score in scores.items()})
+        try:
+            replica_current = self._replica_is_current()
+            self._execute(self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'RAW', 'data': data}
+            ), 'values.batchUpdate')
+            self._write_through(data, replica_current)
+            print(f"Scores of {len(scores)} job(s) updated")
+            return True
 
         except HttpError as error:
             print(f'An error occurred: {error}')
+            return False
+
+    def _coalesce_ranges(self, cells_by_row: Dict[int, Dict[int, str]]) -> List[Dict]:
+        """
+        Merge cell writes into as few rectangular ranges as possible
+
+        Adjacent columns in a row become one run, and runs covering the same
+        columns on consecutive rows become one block.
+        """
+        # (first column, last column) -> list of (row number, values)
+        runs = {}
+        for row_number in sorted(cells_by_row):
+            columns = sorted(cells_by_row[row_number])
+            start = 0
+            for i in range(1, len(columns) + 1):
+                if i == len(columns) or columns[i] != columns[i - 1] + 1:
+                    run_columns = columns[start:i]
+                    key = (run_columns[0], run_columns[-1])
+                    values = [cells_by_row[row_number][column] for column in run_columns]
+                    runs.setdefault(key, []).append((row_number, values))
+                    start = i
+
+        data = []
+        for (first_column, last_column), rows in sorted(runs.items()):
+            block = [rows[0]]
+            for row in rows[1:] + [None]:
+                if row is not None and row[0] == block[-1][0] + 1:
+                    block.append(row)
+                    continue
+
+                data.append({
+                    'range': self._range(f"{column_letter(first_column)}{block[0][0]}:"
+                                         f"{column_letter(last_column)}{block[-1][0]}"),
+                    'values': [values for _, values in block]
+                })
+                if row is not None:
+                    block = [row]
+        return data
 
 
 if __name__ == "__main__":
@@ -0,0 +1,169 @@
+# HTTP Cache - On-disk cache of job pages with ETag/Last-Modified revalidation
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class ResponseCache:
+    """
+    Content-addressed cache of downloaded job pages
+
+    Each entry is stored under the SHA-256 of the normalized job URL as
+    '<key>.json': the page's validators, the job fields parsed from it and
+    the access time. The page itself isn't kept - a 304 answer only needs
+    the parsed fields, and a streamed page is never read to the end. Entries
+    expire after the TTL and the least recently used ones are evicted once
+    the entries exceed max_bytes.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float, max_bytes: int):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.index = None  # key -> metadata, loaded on first use
+        self.stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Drop query string, fragment and case differences from a job URL"""
+        parsed = urlparse(url.strip())
+        path = parsed.path.rstrip('/') + '/'
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}"
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(self.normalize_url(url).encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def _load_index(self):
+        """Read all entry metadata from disk (called with the lock held)"""
+        if self.index is not None:
+            return
+
+        self.index = {}
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, name), 'r') as f:
+                    self.index[name[:-5]] = json.load(f)
+            except (OSError, ValueError):
+                continue
+
+    def _write_meta(self, key: str, meta: Dict):
+        tmp_path = self._path(key, '.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path(key, '.json'))
+
+    def _remove(self, key: str):
+        for suffix in ('.json', '.html.gz'):  # .html.gz: page bodies stored by older versions
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+        self.index.pop(key, None)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached entry
+
+        Returns:
+            Entry metadata, or None if the URL is not cached or has expired
+        """
+        key = self._key(url)
+        with self.lock:
+            self._load_index()
+            meta = self.index.get(key)
+            if meta is None:
+                self.stats['misses'] += 1
+                return None
+
+            if time.time() - meta['stored_at'] > self.ttl_seconds:
+                self._remove(key)
+                self.stats['misses'] += 1
+                return None
+
+            return meta
+
+    @staticmethod
+    def conditional_headers(meta: Dict) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def touch(self, url: str):
+        """Record a successful revalidation (304) of a cached entry"""
+        key = self._key(url)
+        with self.lock:
+            self._load_index()
+            meta = self.index.get(key)
+            if meta is None:
+                return
+            meta['last_access'] = time.time()
+            self._write_meta(key, meta)
+            self.stats['hits'] += 1
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], fields: Dict):
+        """
+        Store a page's validators and parsed job fields
+
+        Pages without an ETag or Last-Modified header cannot be revalidated,
+        so they are not cached.
+        """
+        if not etag and not last_modified:
+            return
+
+        key = self._key(url)
+        now = time.time()
+        meta = {
+            'url': self.normalize_url(url),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': now,
+            'last_access': now,
+            'fields': fields,
+        }
+        meta['size'] = len(json.dumps(meta))
+
+        with self.lock:
+            self._load_index()
+            os.makedirs(self.directory, exist_ok=True)
+            self._write_meta(key, meta)
+
+            self.index[key] = meta
+            self.stats['stores'] += 1
+            self._evict()
+
+    def _evict(self):
+        """Remove expired entries, then least recently used ones over the size limit"""
+        now = time.time()
+        for key, meta in list(self.index.items()):
+            if now - meta['stored_at'] > self.ttl_seconds:
+                self._remove(key)
+                self.stats['evictions'] += 1
+
+        total = sum(meta['size'] for meta in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, meta in sorted(self.index.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            total -= meta['size']
+            self._remove(key)
+            self.stats['evictions'] += 1
@@ -0,0 +1,185 @@
+# Ingest Journal - Reads saved_jobs.txt incrementally and tracks each URL's progress
+
+import json
+import os
+import threading
+from typing import Dict, List
+
+
+PENDING = 'pending'  # read from saved_jobs.txt, not fetched yet
+FETCHED = 'fetched'  # job details extracted
+WRITTEN = 'written'  # stored in the spreadsheet
+NOTIFIED = 'notified'  # notification sent or queued - done
+FAILED = 'failed'  # extraction failed - done
+SKIPPED = 'skipped'  # already in the tracker - done
+
+DONE_STATES = (NOTIFIED, FAILED, SKIPPED)
+
+
+class IngestJournal:
+    """
+    Byte-offset checkpoint over saved_jobs.txt plus a per-URL state journal
+
+    The input file is never rewritten: each read starts at the checkpointed
+    offset, so URLs appended while a run is busy are picked up by the next
+    one. Every URL moves pending -> fetched -> written -> notified (or
+    failed), and each step is appended to the journal, so a run that crashes
+    is resumed at the step each URL had reached. Extracted job data is kept
+    in the journal until the job is notified, so resumed jobs aren't fetched
+    again.
+    """
+
+    def __init__(self, input_file: str, checkpoint_file: str, journal_file: str,
+                 compact_after: int = 1000, canonicalize=None):
+        self.input_file = input_file
+        self.canonicalize = canonicalize or str.strip  # URL -> key; copies of one job share it
+        self.checkpoint_file = checkpoint_file
+        self.journal_file = journal_file
+        self.compact_after = compact_after
+        self.offset = 0  # bytes of input_file already read
+        self.inode = None  # detects the file being replaced
+        self.states = {}  # url -> state, for URLs not done yet
+        self.jobs = {}  # url -> extracted job data, for fetched/written URLs
+        self.records = 0  # lines in the journal file
+        self.lock = threading.Lock()  # pipeline stages record progress from their own threads
+
+        self._load_checkpoint()
+        self._replay()
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_file):
+            return
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+            self.offset = checkpoint['offset']
+            self.inode = checkpoint.get('inode')
+        except (OSError, ValueError, KeyError):
+            print(f"Could not read {self.checkpoint_file}, reading {self.input_file} from the start")
+
+    def _save_checkpoint(self):
+        tmp_path = self.checkpoint_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'offset': self.offset, 'inode': self.inode}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_file)
+
+    def _replay(self):
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'r') as f:
+            for line in f:
+                self.records += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash mid-write
+                self._apply(record)
+
+    def _apply(self, record: Dict):
+        url, state = record['url'], record['state']
+        if state in DONE_STATES:
+            self.states.pop(url, None)
+            self.jobs.pop(url, None)
+            return
+        self.states[url] = state
+        if 'job' in record:
+            self.jobs[url] = record['job']
+
+    def _append(self, records: List[Dict]):
+        """Write state changes durably, then apply them in memory"""
+        if not records:
+            return
+        with self.lock:
+            with open(self.journal_file, 'a') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            for record in records:
+                self._apply(record)
+            self.records += len(records)
+
+            if self.records > self.compact_after and self.records > 2 * len(self.states):
+                self.compact()
+
+    def compact(self):
+        """Rewrite the journal with only the URLs that aren't done"""
+        tmp_path = self.journal_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for url, state in self.states.items():
+                record = {'url': url, 'state': state}
+                if url in self.jobs:
+                    record['job'] = self.jobs[url]
+                f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_file)
+        self.records = len(self.states)
+
+    def read_new(self, include_partial: bool = True) -> List[str]:
+        """
+        Read the URLs appended to the input file since the last call
+
+        A last line without a newline may still be being written; it's only
+        read when include_partial is set (the file has stopped growing).
+        New URLs are journaled as pending before the checkpoint moves, so a
+        crash in between at worst re-reads URLs that are already pending.
+
+        Returns:
+            Canonical URLs read by this call (URLs already in progress are skipped)
+        """
+        try:
+            stat = os.stat(self.input_file)
+        except OSError:
+            return []
+
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            # File was replaced or truncated by hand, start over
+            self.offset = 0
+            self.inode = stat.st_ino
+        if stat.st_size == self.offset:
+            return []
+
+        with open(self.input_file, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read()
+        if not include_partial:
+            data = data[:data.rfind(b'\n') + 1]
+        if not data:
+            return []
+
+        urls = []
+        for line in data.decode('utf-8', errors='replace').splitlines():
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            url = self.canonicalize(line)
+            if url not in self.states and url not in urls:
+                urls.append(url)
+
+        self._append([{'url': url, 'state': PENDING} for url in urls])
+        self.offset += len(data)
+        self._save_checkpoint()
+        return urls
+
+    def urls_in(self, *states: str) -> List[str]:
+        return [url for url, state in self.states.items() if state in states]
+
+    def resumable_jobs(self) -> List[Dict]:
+        """Job data extracted by an earlier run that still has to be written or notified"""
+        return [self.jobs[url] for url in self.urls_in(FETCHED, WRITTEN) if url in self.jobs]
+
+    def mark(self, urls: List[str], state: str):
+        self._append([{'url': url, 'state': state} for url in urls])
+
+    def mark_fetched(self, jobs: List[Dict]):
+        self._append([{'url': job['url'], 'state': FETCHED, 'job': job} for job in jobs])
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        counts = {}
+        for state in self.states.values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
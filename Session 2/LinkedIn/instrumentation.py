@@ -0,0 +1,144 @@
+# Instrumentation - Timing spans and counters for fetch, parse, Sheets and SMTP work
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict
+
+# Histogram bucket upper bounds in seconds (Prometheus style)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class SpanStats:
+    """Count, total, max and a latency histogram of one kind of span"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last bucket is +Inf
+
+    def add(self, seconds: float, failed: bool):
+        self.count += 1
+        self.errors += failed
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of spans"""
+        target = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(BUCKETS + (self.max,), self.buckets):
+            seen += bucket_count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """
+    Thread-safe registry of spans and counters for one run
+
+    Usage:
+        with metrics.span('fetch'):
+            response = session.get(url)
+        metrics.count('http_bytes', len(response.content))
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.spans = {}  # name -> SpanStats
+        self.counters = {}  # name -> number
+
+    @contextmanager
+    def span(self, name: str):
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self.lock:
+                self.spans.setdefault(name, SpanStats()).add(elapsed, failed)
+
+    def count(self, name: str, value: float = 1):
+        if not value:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.spans = {}
+            self.counters = {}
+
+    def report(self) -> Dict:
+        """JSON-friendly summary of every span and counter"""
+        with self.lock:
+            return {
+                'started': datetime.fromtimestamp(self.started).strftime('%Y-%m-%d %H:%M:%S'),
+                'duration_seconds': round(time.time() - self.started, 3),
+                'spans': {
+                    name: {
+                        'count': stats.count,
+                        'errors': stats.errors,
+                        'total_ms': round(stats.total * 1000, 1),
+                        'avg_ms': round(stats.total / stats.count * 1000, 1),
+                        'p95_ms': round(stats.percentile(0.95) * 1000, 1),
+                        'max_ms': round(stats.max * 1000, 1),
+                    }
+                    for name, stats in sorted(self.spans.items())
+                },
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def prometheus(self, prefix: str = 'job_tracker') -> str:
+        """The same data in Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            lines.append(f'# TYPE {prefix}_span_seconds histogram')
+            for name, stats in sorted(self.spans.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(BUCKETS, stats.buckets):
+                    cumulative += bucket_count
+                    lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="+Inf"}} {stats.count}')
+                lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {stats.total:.6f}')
+                lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {stats.count}')
+
+            lines.append(f'# TYPE {prefix}_span_errors_total counter')
+            for name, stats in sorted(self.spans.items()):
+                lines.append(f'{prefix}_span_errors_total{{span="{name}"}} {stats.errors}')
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f'# TYPE {prefix}_{name}_total counter')
+                lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write_reports(self, report_file: str = None, prometheus_file: str = None):
+        """Write the JSON report and/or the Prometheus text file (atomically)"""
+        for path, content in ((report_file, lambda: json.dumps(self.report(), indent=2)),
+                              (prometheus_file, self.prometheus)):
+            if not path:
+                continue
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                f.write(content())
+            os.replace(tmp_path, path)
+
+
+# Shared by every module of the tracker
+metrics = Metrics()
+span = metrics.span
+count = metrics.count
@@ -1,11 +1,26 @@
 # Job Extractor Module - Extracts job details from LinkedIn URLs
 
+import codecs
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
 import re
-from typing import Dict, Optional
-import time
+from typing import Dict, Iterator, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from rate_limiter import HostRateLimiter
+from http_cache import ResponseCache
+from job_parser import parse_job_page, StreamingJobParser
+from instrumentation import metrics
+import config
+
+
+try:
+    import brotli  # noqa: F401  (lets requests decode 'br' responses)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
 
 
 class LinkedInJobExtractor:
@@ -13,8 +28,76 @@ class LinkedInJobExtractor:
 
     def __init__(self):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'Connection': 'keep-alive',
         }
+        self.session = self._create_session()
+        self.cache = None
+        if config.CACHE_CONFIG['enabled']:
+            self.cache = ResponseCache(
+                config.CACHE_CONFIG['directory'],
+                config.CACHE_CONFIG['ttl_hours'] * 3600,
+                config.CACHE_CONFIG['max_size_mb'] * 1024 * 1024
+            )
+        self.streaming = config.FETCH_CONFIG['streaming']
+        self.chunk_size = config.FETCH_CONFIG['chunk_size']
+        self.drain_max_bytes = config.FETCH_CONFIG['drain_max_bytes']
+        self.stream_stats = {'pages': 0, 'stopped_early': 0, 'bytes_read': 0,
+                             'bytes_skipped': 0, 'bytes_drained': 0, 'connections_closed': 0}
+        self.stats_lock = threading.Lock()
+        self.max_in_flight = config.FETCH_CONFIG['max_in_flight']
+        self.rate_limiter = HostRateLimiter(
+            config.FETCH_CONFIG['requests_per_second'],
+            config.FETCH_CONFIG['burst']
+        )
+
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session with retry/backoff on 429 and 5xx"""
+        retry = Retry(
+            total=config.FETCH_CONFIG['max_retries'],
+            backoff_factor=config.FETCH_CONFIG['backoff_factor'],
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET'],
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config.FETCH_CONFIG['pool_size'],
+            pool_maxsize=max(config.FETCH_CONFIG['pool_size'], config.FETCH_CONFIG['max_in_flight']),
+            max_retries=retry,
+        )
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Report how many connections were opened and how often they were reused
+
+        Returns:
+            Dictionary with 'requests', 'connections' and 'reused' counts
+        """
+        stats = {'requests': 0, 'connections': 0, 'reused': 0}
+
+        # Both schemes share one adapter, so count each pool manager once
+        pool_managers = {id(adapter.poolmanager): adapter.poolmanager
+                         for adapter in self.session.adapters.values()}
+        for pool_manager in pool_managers.values():
+            for key in pool_manager.pools.keys():
+                pool = pool_manager.pools.get(key)
+                if pool is not None:
+                    stats['requests'] += pool.num_requests
+                    stats['connections'] += pool.num_connections
+
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        return stats
+
+    def close(self):
+        """Close all pooled connections"""
+        self.session.close()
 
     def extract_job_details(self, job_url: str) -> Optional[Dict]:
         """
@@ -27,147 +110,160 @@ class LinkedInJobExtractor:
             Dictionary with job details or None if extraction fails
         """
         try:
-            # Add delay to be respectful
-            time.sleep(2)
-
-            response = requests.get(job_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            job_data = {
-                'url': job_url,
-                'title': self._extract_title(soup),
-                'company': self._extract_company(soup),
-                'location': self._extract_location(soup),
-                'description': self._extract_description(soup),
-                'posted_date': self._extract_posted_date(soup),
-                'job_type': self._extract_job_type(soup),
-                'experience_level': self._extract_experience_level(soup),
-                'extracted_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'status': 'Saved',
-                'notes': '',
-                'application_date': '',
-                'follow_up_date': '',
-            }
-
-            return job_data
+            # Revalidate a previously downloaded copy instead of refetching it
+            cached = self.cache.get(job_url) if self.cache else None
+            request_headers = ResponseCache.conditional_headers(cached) if cached else {}
+
+            # Wait for a request slot on this host to be respectful
+            self.rate_limiter.acquire(job_url)
+
+            with metrics.span('fetch'):
+                response = self.session.get(job_url, headers=request_headers, timeout=10,
+                                            stream=self.streaming)
+                if not self.streaming:
+                    body = response.content
+            metrics.count('http_requests')
+            retries = getattr(response.raw, 'retries', None)
+            metrics.count('http_retries', len(retries.history) if retries else 0)
+
+            if cached and response.status_code == 304:
+                # Page unchanged - reuse the fields parsed last time
+                response.close()
+                self.cache.touch(job_url)
+                metrics.count('cache_hits')
+                fields = cached['fields']
+            else:
+                response.raise_for_status()
+
+                # When streaming, 'parse' also covers reading the body
+                with metrics.span('parse'):
+                    if self.streaming:
+                        fields = self._parse_streaming(response)
+                    else:
+                        metrics.count('http_bytes', response.raw.tell())
+                        fields = parse_job_page(body)
+
+                if self.cache:
+                    self.cache.put(
+                        job_url,
+                        response.headers.get('ETag'),
+                        response.headers.get('Last-Modified'),
+                        fields
+                    )
+
+            return self._build_job_data(job_url, fields)
 
         except Exception as e:
+            metrics.count('fetch_errors')
             print(f"Error extracting job details from {job_url}: {str(e)}")
             return None
 
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extract job title"""
-        try:
-            title = soup.find('h1', class_='top-card-layout__title')
-            if title:
-                return title.get_text(strip=True)
-
-            # Alternative selectors
-            title = soup.find('h1')
-            if title:
-                return title.get_text(strip=True)
-        except:
-            pass
-        return "N/A"
-
-    def _extract_company(self, soup: BeautifulSoup) -> str:
-        """Extract company name"""
-        try:
-            company = soup.find('a', class_='topcard__org-name-link')
-            if company:
-                return company.get_text(strip=True)
-
-            company = soup.find('span', class_='topcard__flavor')
-            if company:
-                return company.get_text(strip=True)
-        except:
-            pass
-        return "N/A"
-
-    def _extract_location(self, soup: BeautifulSoup) -> str:
-        """Extract job location"""
-        try:
-            location = soup.find('span', class_='topcard__flavor topcard__flavor--bullet')
-            if location:
-                return location.get_text(strip=True)
-
-            # Try alternative location selectors
-            location = soup.find('span', class_='topcard__flavor--bullet')
-            if location:
-                return location.get_text(strip=True)
-        except:
-            pass
-        return "N/A"
-
-    def _extract_description(self, soup: BeautifulSoup) -> str:
-        """Extract job description"""
-        try:
-            desc_div = soup.find('div', class_='show-more-less-html__markup')
-            if desc_div:
-                return desc_div.get_text(strip=True)[:1000]  # Limit to 1000 chars
-
-            # Alternative selector
-            desc_div = soup.find('div', class_='description__text')
-            if desc_div:
-                return desc_div.get_text(strip=True)[:1000]
-        except:
-            pass
-        return "N/A"
-
-    def _extract_posted_date(self, soup: BeautifulSoup) -> str:
-        """Extract when the job was posted"""
-        try:
-            posted = soup.find('span', class_='posted-time-ago__text')
-            if posted:
-                return posted.get_text(strip=True)
-        except:
-            pass
-        return "N/A"
-
-    def _extract_job_type(self, soup: BeautifulSoup) -> str:
-        """Extract job type (Full-time, Part-time, etc.)"""
-        try:
-            criteria_list = soup.find('ul', class_='description__job-criteria-list')
-            if criteria_list:
-                items = criteria_list.find_all('li')
-                for item in items:
-                    if 'Employment type' in item.get_text():
-                        return item.find('span', class_='description__job-criteria-text').get_text(strip=True)
-        except:
-            pass
-        return "N/A"
-
-    def _extract_experience_level(self, soup: BeautifulSoup) -> str:
-        """Extract experience level required"""
+    def _parse_streaming(self, response: requests.Response) -> Dict:
+        """
+        Read a page in chunks and stop parsing as soon as every job field is parsed
+
+        A connection only goes back to the pool once its response has been
+        read to the end. So after an early stop, a rest of up to
+        drain_max_bytes is still read and thrown away (cheaper than a new
+        handshake). A longer rest is skipped by closing the connection.
+
+        Returns:
+            The parsed job fields
+        """
+        content_type = response.headers.get('Content-Type', '').lower()
+        encoding = response.encoding if 'charset' in content_type else 'utf-8'
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+        parser = StreamingJobParser()
+        stopped_early = False
+
         try:
-            criteria_list = soup.find('ul', class_='description__job-criteria-list')
-            if criteria_list:
-                items = criteria_list.find_all('li')
-                for item in items:
-                    if 'Seniority level' in item.get_text():
-                        return item.find('span', class_='description__job-criteria-text').get_text(strip=True)
-        except:
-            pass
-        return "N/A"
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                parser.feed(decoder.decode(chunk))
+                if parser.complete:
+                    stopped_early = True
+                    break
+            if not stopped_early:
+                parser.feed(decoder.decode(b'', final=True))
+                parser.close()
+
+            bytes_read = response.raw.tell()  # bytes on the wire, before decompression
+            drained, closed = self._drain(response, bytes_read) if stopped_early else (0, False)
+        finally:
+            response.close()  # returns the connection to the pool if the body was read to the end
+
+        metrics.count('http_bytes', bytes_read + drained)
+        page_size = response.headers.get('Content-Length')
+        with self.stats_lock:
+            self.stream_stats['pages'] += 1
+            self.stream_stats['bytes_read'] += bytes_read
+            self.stream_stats['bytes_drained'] += drained
+            self.stream_stats['connections_closed'] += closed
+            if stopped_early:
+                self.stream_stats['stopped_early'] += 1
+                if page_size and page_size.isdigit():
+                    self.stream_stats['bytes_skipped'] += max(0, int(page_size) - bytes_read - drained)
+
+        return parser.result()
+
+    def _drain(self, response: requests.Response, bytes_read: int) -> Tuple[int, bool]:
+        """
+        Read the rest of a page that was stopped early if it is small enough
+
+        Returns:
+            Tuple of (bytes read and discarded, True if the rest was too long
+            and the connection will be closed instead of reused)
+        """
+        page_size = response.headers.get('Content-Length')
+        if page_size and page_size.isdigit() and int(page_size) - bytes_read > self.drain_max_bytes:
+            return 0, True
+        # Without a Content-Length, give up once the limit is passed
+        for _ in response.iter_content(chunk_size=self.chunk_size):
+            if response.raw.tell() - bytes_read > self.drain_max_bytes:
+                return response.raw.tell() - bytes_read, True
+        return response.raw.tell() - bytes_read, False
+
+    def _build_job_data(self, job_url: str, fields: Dict) -> Dict:
+        """Combine extracted fields with the tracking columns for a new job"""
+        job_data = {'url': job_url}
+        job_data.update(fields)
+        job_data.update({
+            'extracted_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'status': 'Saved',
+            'notes': '',
+            'application_date': '',
+            'follow_up_date': '',
+        })
+        return job_data
 
     def extract_multiple_jobs(self, job_urls: list) -> list:
         """
         Extract details for multiple job URLs
 
+        Pages are downloaded concurrently (up to FETCH_CONFIG['max_in_flight']
+        at a time) while the per-host rate limiter paces the requests.
+        A failed URL does not affect the others.
+
         Args:
             job_urls: List of LinkedIn job URLs
 
         Returns:
-            List of job data dictionaries
+            List of job data dictionaries, in the same order as job_urls
         """
-        jobs_data = []
+        total = len(job_urls)
 
-        for i, url in enumerate(job_urls, 1):
-            print(f"Extracting job {i}/{len(job_urls)}...")
-            job_data = self.extract_job_details(url)
+        def extract(indexed_url):
+            i, url = indexed_url
+            print(f"Extracting job {i}/{total}...")
+            return self.extract_job_details(url)
 
+        workers = max(1, min(self.max_in_flight, total))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in input order regardless of completion order
+            results = list(executor.map(extract, enumerate(job_urls, 1)))
+
+        jobs_data = []
+        for url, job_data in zip(job_urls, results):
             if job_data:
                 jobs_data.append(job_data)
             else:
@@ -175,6 +271,41 @@ class LinkedInJobExtractor:
 
         return jobs_data
 
+    def iter_jobs(self, job_urls: list) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """
+        Yield (url, job data or None) for each URL as soon as its page is parsed
+
+        Results come in completion order. At most max_in_flight pages are
+        outstanding and the next download only starts once the caller has
+        taken a result, so a slow consumer slows extraction down instead of
+        piling up parsed pages.
+        """
+        total = len(job_urls)
+        remaining = iter(enumerate(job_urls, 1))
+        workers = max(1, min(self.max_in_flight, total))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = {}
+
+            def submit_next():
+                for i, url in remaining:
+                    print(f"Extracting job {i}/{total}...")
+                    in_flight[executor.submit(self.extract_job_details, url)] = url
+                    return
+
+            for _ in range(workers):
+                submit_next()
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    url = in_flight.pop(future)
+                    job_data = future.result()
+                    if not job_data:
+                        print(f"Failed to extract: {url}")
+                    yield url, job_data
+                    submit_next()
+
 
 if __name__ == "__main__":
     # Test the extractor
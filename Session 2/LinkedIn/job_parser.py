@@ -0,0 +1,336 @@
+# Job Parser - Single-pass extraction of job fields from LinkedIn job pages
+
+import re
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup, SoupStrainer
+from typing import Callable, Dict, List
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+
+DESCRIPTION_LIMIT = 1000
+
+# Selectors for each field in priority order: (field, tag, required classes).
+# An empty class set matches any element with that tag.
+FIELD_SELECTORS = [
+    ('title', 'h1', {'top-card-layout__title'}),
+    ('title', 'h1', set()),
+    ('company', 'a', {'topcard__org-name-link'}),
+    ('company', 'span', {'topcard__flavor'}),
+    ('location', 'span', {'topcard__flavor', 'topcard__flavor--bullet'}),
+    ('location', 'span', {'topcard__flavor--bullet'}),
+    ('description', 'div', {'show-more-less-html__markup'}),
+    ('description', 'div', {'description__text'}),
+    ('posted_date', 'span', {'posted-time-ago__text'}),
+]
+
+CRITERIA_LIST_CLASS = 'description__job-criteria-list'
+CRITERIA_TEXT_CLASS = 'description__job-criteria-text'
+
+# Criteria list headings and the job field each one fills
+CRITERIA_FIELDS = {
+    'Employment type': 'job_type',
+    'Seniority level': 'experience_level',
+}
+
+FIELDS = ['title', 'company', 'location', 'description', 'posted_date',
+          'job_type', 'experience_level']
+
+
+def _compile_selectors() -> Dict[str, list]:
+    """Group the selectors by tag so each element is checked only against its own tag"""
+    compiled = {}
+    for priority, (field, tag, classes) in enumerate(FIELD_SELECTORS):
+        compiled.setdefault(tag, []).append((priority, field, frozenset(classes)))
+    return compiled
+
+
+COMPILED_SELECTORS = _compile_selectors()
+
+# Best possible priority per field - once matched, no later element can replace it
+TOP_PRIORITY = {}
+for _priority, (_field, _, _) in enumerate(FIELD_SELECTORS):
+    TOP_PRIORITY.setdefault(_field, _priority)
+
+# Elements that never have a closing tag
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+# Matches a class attribute containing any class the fields can be recognised by.
+# A regex works for both single class tokens and the full multi-class string,
+# which different BeautifulSoup versions hand to the strainer.
+TARGET_CLASSES = sorted({cls for _, _, classes in FIELD_SELECTORS for cls in classes}
+                        | {CRITERIA_LIST_CLASS})
+TARGET_CLASS_PATTERN = re.compile(
+    r'(?:^|\s)(?:' + '|'.join(re.escape(cls) for cls in TARGET_CLASSES) + r')(?:\s|$)'
+)
+
+
+class _FieldCollector:
+    """Keeps the best (highest priority) match seen so far for each field"""
+
+    def __init__(self, get_text: Callable):
+        self.get_text = get_text
+        self.matches = {}  # field -> (priority, element)
+        self.criteria = {}
+
+    def offer(self, tag: str, classes: set, element) -> List[str]:
+        """Record the element for every field it is the best match for so far"""
+        assigned = []
+        for priority, field, required in COMPILED_SELECTORS.get(tag, ()):
+            best = self.matches.get(field)
+            if best is not None and best[0] <= priority:
+                continue
+            if required <= classes:
+                self.matches[field] = (priority, element)
+                assigned.append(field)
+        return assigned
+
+    def offer_criterion(self, heading_text: str, value_text: str):
+        for heading, field in CRITERIA_FIELDS.items():
+            if field not in self.criteria and heading in heading_text:
+                self.criteria[field] = value_text
+
+    def result(self) -> Dict[str, str]:
+        fields = {}
+        for field in FIELDS:
+            if field in CRITERIA_FIELDS.values():
+                fields[field] = self.criteria.get(field, 'N/A')
+                continue
+
+            match = self.matches.get(field)
+            if match is None:
+                fields[field] = 'N/A'
+                continue
+
+            text = self.get_text(match[1])
+            fields[field] = text[:DESCRIPTION_LIMIT] if field == 'description' else text
+        return fields
+
+
+def _lxml_text(element) -> str:
+    return ''.join(piece.strip() for piece in element.itertext())
+
+
+def _parse_with_lxml(content) -> Dict[str, str]:
+    tree = lxml.html.fromstring(content)
+    collector = _FieldCollector(_lxml_text)
+
+    for element in tree.iter():
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+
+        classes = set(element.get('class', '').split())
+        collector.offer(tag, classes, element)
+
+        if tag == 'ul' and CRITERIA_LIST_CLASS in classes:
+            for item in element.iter('li'):
+                value = item.find_class(CRITERIA_TEXT_CLASS)
+                if value:
+                    collector.offer_criterion(_lxml_text(item), _lxml_text(value[0]))
+
+    return collector.result()
+
+
+def _soup_text(element) -> str:
+    return element.get_text(strip=True)
+
+
+def _parse_with_soup(content) -> Dict[str, str]:
+    # Only keep the elements carrying one of the classes we look for
+    strainer = SoupStrainer(attrs={'class': TARGET_CLASS_PATTERN})
+    soup = BeautifulSoup(content, 'html.parser', parse_only=strainer)
+    collector = _FieldCollector(_soup_text)
+
+    for element in soup.find_all(True):
+        classes = set(element.get('class', []))
+        collector.offer(element.name, classes, element)
+
+        if element.name == 'ul' and CRITERIA_LIST_CLASS in classes:
+            for item in element.find_all('li'):
+                value = item.find(class_=CRITERIA_TEXT_CLASS)
+                if value:
+                    collector.offer_criterion(item.get_text(), _soup_text(value))
+
+    return collector.result()
+
+
+class _Capture:
+    """Text collected from one open element while the page streams in"""
+
+    def __init__(self, tag: str, depth: int, limit: int = None):
+        self.tag = tag
+        self.depth = depth
+        self.limit = limit
+        self.pieces = []
+        self.length = 0
+        self.closed = False
+
+    def add(self, text: str):
+        if self.limit is not None and self.length >= self.limit:
+            return
+        self.pieces.append(text)
+        self.length += len(text)
+
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and self.length >= self.limit
+
+    def text(self) -> str:
+        return ''.join(self.pieces)
+
+
+class StreamingJobParser(HTMLParser):
+    """
+    Incremental job page parser fed with chunks as they are downloaded
+
+    Produces the same fields as parse_job_page, but can tell (via `complete`)
+    when every field has been found so the rest of the page can be skipped.
+    Text is stripped per text node, matching BeautifulSoup's get_text(strip=True).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.collector = _FieldCollector(lambda capture: capture.text())
+        self.stack = []  # open tag names
+        self.captures = []  # captures whose element is still open
+        self.pending_text = []
+        self.criteria_list = None
+        self.criteria_item = None
+        self.criteria_value = None
+        self.criteria_done = False
+
+    def _flush_text(self):
+        """Hand the text node collected since the last tag to the open captures"""
+        if not self.pending_text:
+            return
+        text = ''.join(self.pending_text).strip()
+        self.pending_text = []
+        if text:
+            for capture in self.captures:
+                capture.add(text)
+
+    def _open_capture(self, tag: str, limit: int = None) -> _Capture:
+        capture = _Capture(tag, len(self.stack), limit)
+        self.captures.append(capture)
+        return capture
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        classes = set()
+        for name, value in attrs:
+            if name == 'class' and value:
+                classes = set(value.split())
+
+        if tag in VOID_ELEMENTS:
+            return  # none of the fields live in a void element
+        self.stack.append(tag)
+
+        if tag in COMPILED_SELECTORS:
+            capture = _Capture(tag, len(self.stack))
+            fields = self.collector.offer(tag, classes, capture)
+            if fields:
+                if fields == ['description']:
+                    capture.limit = DESCRIPTION_LIMIT
+                self.captures.append(capture)
+
+        if tag == 'ul' and CRITERIA_LIST_CLASS in classes and self.criteria_list is None:
+            self.criteria_list = self._open_capture(tag)
+        elif tag == 'li' and self.criteria_list is not None and not self.criteria_list.closed:
+            self.criteria_item = self._open_capture(tag)
+            self.criteria_value = None
+        elif (self.criteria_item is not None and not self.criteria_item.closed
+              and CRITERIA_TEXT_CLASS in classes and self.criteria_value is None):
+            self.criteria_value = self._open_capture(tag)
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag not in self.stack:
+            return  # stray closing tag
+
+        while self.stack:
+            if self.stack.pop() == tag:
+                break
+        self._close_captures()
+
+    def handle_data(self, data):
+        self.pending_text.append(data)
+
+    # Comments, processing instructions and declarations end a text node, as in the tree parsers
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def handle_pi(self, data):
+        self._flush_text()
+
+    def handle_decl(self, decl):
+        self._flush_text()
+
+    def unknown_decl(self, data):
+        self._flush_text()
+
+    def _close_captures(self):
+        """Finish every capture whose element is no longer open"""
+        depth = len(self.stack)
+        still_open = []
+        for capture in self.captures:
+            if capture.depth > depth:
+                capture.closed = True
+            else:
+                still_open.append(capture)
+        self.captures = still_open
+
+        item = self.criteria_item
+        if item is not None and item.closed:
+            if self.criteria_value is not None:
+                self.collector.offer_criterion(item.text(), self.criteria_value.text())
+            self.criteria_item = None
+            self.criteria_value = None
+
+        if self.criteria_list is not None and self.criteria_list.closed:
+            self.criteria_done = True
+
+    @property
+    def complete(self) -> bool:
+        """True once no later part of the page can change any field"""
+        if not (self.criteria_done or len(self.collector.criteria) == len(CRITERIA_FIELDS)):
+            return False
+
+        for field, top in TOP_PRIORITY.items():
+            match = self.collector.matches.get(field)
+            if match is None or match[0] != top:
+                return False
+            capture = match[1]
+            if not (capture.closed or capture.full):
+                return False
+        return True
+
+    def result(self) -> Dict[str, str]:
+        """Fields found so far ('N/A' for missing ones)"""
+        self._flush_text()
+        return self.collector.result()
+
+
+def parse_job_page(content) -> Dict[str, str]:
+    """
+    Extract all job fields from a LinkedIn job page in a single traversal
+
+    Uses lxml when it is installed and a SoupStrainer-limited BeautifulSoup
+    tree otherwise. The strained tree only holds elements with one of the
+    target classes, so the plain <h1> title fallback is lxml-only.
+
+    Args:
+        content: Page HTML (bytes or str)
+
+    Returns:
+        Dictionary with title, company, location, description, posted_date,
+        job_type and experience_level ('N/A' for missing fields)
+    """
+    if HAS_LXML:
+        return _parse_with_lxml(content)
+    return _parse_with_soup(content)
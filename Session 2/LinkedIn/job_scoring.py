@@ -0,0 +1,99 @@
+# Job Scoring - Rates extracted jobs against JOB_CRITERIA
+
+import re
+from typing import Dict, List, Set
+
+# JOB_CRITERIA key -> scoring category
+CRITERIA_CATEGORIES = {
+    'job_titles': 'title',
+    'keywords': 'keyword',
+    'industries': 'industry',
+    'job_types': 'job_type',
+    'experience_level': 'seniority',
+}
+
+# Job fields scanned for criteria terms
+SCANNED_FIELDS = ['title', 'company', 'description', 'job_type', 'experience_level']
+
+
+class JobScorer:
+    """
+    Scores jobs from 0 to 100 against search criteria
+
+    Every criteria term is compiled once into a single case-insensitive
+    regex (longest terms first, on word boundaries), so each field of a job
+    is scanned in one pass no matter how many terms there are. A term can
+    belong to several categories; the categories found in each field decide
+    the score:
+
+        title      a wanted job title in the title (a keyword there counts half)
+        keyword    share of the keywords found anywhere (all of them, or 3, for full marks)
+        industry   an industry in the title, company or description
+        job_type   a wanted job type in the Job Type field
+        seniority  the wanted experience level in the Experience Level field
+
+    Args:
+        criteria: Dictionary shaped like config.JOB_CRITERIA
+        weights: Points for each category (see SCORING_CONFIG)
+    """
+
+    def __init__(self, criteria: Dict, weights: Dict[str, float]):
+        self.weights = weights
+        self.categories = {}  # lowercased term -> set of categories
+        for key, category in CRITERIA_CATEGORIES.items():
+            terms = criteria.get(key) or []
+            if isinstance(terms, str):
+                terms = [terms]
+            for term in terms:
+                if term.strip():
+                    self.categories.setdefault(term.strip().lower(), set()).add(category)
+
+        self.keyword_count = sum('keyword' in found for found in self.categories.values())
+        self.pattern = None
+        if self.categories:
+            alternatives = '|'.join(re.escape(term) for term in
+                                    sorted(self.categories, key=len, reverse=True))
+            self.pattern = re.compile(rf'(?<!\w)(?:{alternatives})(?!\w)', re.IGNORECASE)
+
+    def _terms_in(self, text: str) -> Set[str]:
+        if not text or not self.pattern:
+            return set()
+        return {match.group(0).lower() for match in self.pattern.finditer(text)}
+
+    def _categories_in(self, terms: Set[str]) -> Set[str]:
+        found = set()
+        for term in terms:
+            found |= self.categories[term]
+        return found
+
+    def score(self, job: Dict) -> int:
+        """Relevance of one job, 0-100"""
+        terms = {field: self._terms_in(str(job.get(field) or '')) for field in SCANNED_FIELDS}
+        in_title = self._categories_in(terms['title'])
+
+        points = 0.0
+        if 'title' in in_title:
+            points += self.weights['title']
+        elif 'keyword' in in_title:
+            points += self.weights['title'] / 2
+
+        all_terms = set().union(*terms.values())
+        keywords_found = sum('keyword' in self.categories[term] for term in all_terms)
+        if self.keyword_count:
+            points += self.weights['keyword'] * min(1.0, keywords_found / min(3, self.keyword_count))
+
+        if 'industry' in self._categories_in(terms['title'] | terms['company'] | terms['description']):
+            points += self.weights['industry']
+        if 'job_type' in self._categories_in(terms['job_type']):
+            points += self.weights['job_type']
+        if 'seniority' in self._categories_in(terms['experience_level']):
+            points += self.weights['seniority']
+
+        total = sum(self.weights.values())
+        return round(100 * points / total) if total else 0
+
+    def score_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Set job['score'] on a batch of jobs (in place) and return them"""
+        for job in jobs:
+            job['score'] = self.score(job)
+        return jobs
@@ -0,0 +1,61 @@
+# Job URLs - Reduces the many forms of a job link to one canonical URL
+
+import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+# /jobs/view/3812345678, /jobs/view/project-manager-at-acme-3812345678, /comm/jobs/view/...
+VIEW_PATH_ID = re.compile(r'/jobs/view/(?:[^/?#]*?-)?(\d{6,})(?:[/?#]|$)')
+
+# ?currentJobId=3812345678 on search and collection pages
+JOB_ID_PARAMS = ('currentJobId', 'jobId')
+
+# Query parameters that only track where the click came from
+TRACKING_PARAMS = re.compile(r'^(utm_\w+|trk\w*|refId|trackingId|eBP|lipi|original_referer|position|pageNum)$')
+
+CANONICAL_JOB_URL = 'https://www.linkedin.com/jobs/view/{}/'
+
+
+def is_linkedin_host(hostname: str) -> bool:
+    """linkedin.com or one of its subdomains (not e.g. evil-linkedin.com)"""
+    hostname = (hostname or '').lower().rstrip('.')
+    return hostname == 'linkedin.com' or hostname.endswith('.linkedin.com')
+
+
+def linkedin_job_id(url: str):
+    """Return the LinkedIn job ID in a URL, or None"""
+    parts = urlsplit(url.strip())
+    if not is_linkedin_host(parts.hostname):
+        return None
+
+    match = VIEW_PATH_ID.search(parts.path)
+    if match:
+        return match.group(1)
+
+    for name, value in parse_qsl(parts.query):
+        if name in JOB_ID_PARAMS and value.isdigit():
+            return value
+    return None
+
+
+def canonical_job_url(url: str) -> str:
+    """
+    Canonical form of a job link, so every copy of a posting has the same key
+
+    LinkedIn links (any subdomain, view or search page, with or without
+    tracking parameters or trailing slash) become
+    https://www.linkedin.com/jobs/view/<job id>/. Other links keep their
+    path but lose the fragment, tracking parameters and host case.
+    """
+    url = url.strip()
+    job_id = linkedin_job_id(url)
+    if job_id:
+        return CANONICAL_JOB_URL.format(job_id)
+
+    parts = urlsplit(url)
+    if not parts.netloc:
+        return url
+    query = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not TRACKING_PARAMS.match(name)]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                       urlencode(query), ''))
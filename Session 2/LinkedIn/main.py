@@ -1,43 +1,206 @@
 # Main Script - LinkedIn Job Tracker
 # Run this script to process saved job URLs and update Google Sheets
 
+import time
+STARTED = time.perf_counter()
+
 import os
-from job_extractor import LinkedInJobExtractor
-from google_sheets_manager import GoogleSheetsManager
-from email_notifier import EmailNotifier
 import config
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
+from typing import Dict, List, Tuple
+
+
+# Sheet columns the daily digest shows
+DIGEST_FIELDS = ['title', 'company', 'location', 'job_type', 'experience_level',
+                 'posted_date', 'url', 'status', 'score']
+
+# Sheet columns reminders are scheduled from
+REMINDER_FIELDS = ['title', 'company', 'url', 'status', 'application_date', 'follow_up_date']
+
+# Sheet columns a job's score is computed from
+SCORED_FIELDS = ['title', 'company', 'description', 'job_type', 'experience_level']
+
+# Sheet columns the repost index is seeded from
+NEAR_DUPLICATE_FIELDS = ['url', 'title', 'description', 'duplicate_of']
+
+# Commands that run once per profile when config.PROFILES is set
+PROFILE_COMMANDS = {
+    '--setup': 'setup_new_tracker',
+    '--process': 'process_new_jobs',
+    '--digest': 'send_daily_digest',
+    '--reminders': 'send_due_reminders',
+    '--rescore': 'rescore_jobs',
+}
 
 
 class LinkedInJobTracker:
     """Main application for tracking LinkedIn jobs"""
 
-    def __init__(self):
-        self.extractor = LinkedInJobExtractor()
-        self.sheets_manager = GoogleSheetsManager()
-        self.sheets_manager.set_spreadsheet_id('1XiK20cWEPF-rNU1BydJwtGHRIjvqUGAQhDA40mNMcT4')
-        self.notifier = EmailNotifier()
-        self.saved_jobs_file = config.SAVED_JOBS_FILE
-
-    def read_saved_jobs(self):
-        """Read job URLs from saved_jobs.txt file"""
+    def __init__(self, extractor=None, sheets_manager=None, notifier=None, profile: Dict = None):
+        # Clients are built on first use (see the properties below), so commands
+        # that don't need Sheets, HTTP or SMTP never pay for importing them.
+        # Ready-made ones can be passed in instead (see benchmark_tracker.py).
+        # A profile (see profiles.profile_settings) gives the tracker its own
+        # input file, sheet, recipient and state directory.
+        self._extractor = extractor
+        self._sheets_manager = sheets_manager
+        self._notifier = notifier
+        self._journal = None
+        self._seen_jobs = None
+        self._scorer = None
+        self._near_duplicates = None
+        self.timings = {}  # startup step -> milliseconds
+        self.keep_outbox = False  # set by the daemon, which runs the outbox for its whole lifetime
+        self.profile = profile or {}
+        self.state_dir = self.profile.get('state_dir', '')
+        if self.state_dir:
+            os.makedirs(self.state_dir, exist_ok=True)
+        self.saved_jobs_file = self.profile.get('saved_jobs_file', config.SAVED_JOBS_FILE)
+
+    def state_path(self, filename: str) -> str:
+        """Where this tracker keeps a state file (inside the profile's directory, if any)"""
+        return os.path.join(self.state_dir, filename)
+
+    def close(self):
+        """Save and close the local indexes that were opened (the seen-jobs filter is saved here)"""
+        if self._seen_jobs is not None:
+            self._seen_jobs.close()
+            self._seen_jobs = None
+        if self._near_duplicates is not None:
+            self._near_duplicates.close()
+            self._near_duplicates = None
+
+    def _timed(self, name: str, factory):
+        started = time.perf_counter()
+        instance = factory()
+        self.timings[name] = (time.perf_counter() - started) * 1000
+        return instance
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            def create():
+                from job_extractor import LinkedInJobExtractor
+                return LinkedInJobExtractor()
+            self._extractor = self._timed('extractor', create)
+        return self._extractor
+
+    @property
+    def sheets_manager(self):
+        if self._sheets_manager is None:
+            def create():
+                from google_sheets_manager import GoogleSheetsManager
+                manager = GoogleSheetsManager(replica_path=self.state_path(config.REPLICA_CONFIG['path']))
+                if self.profile:
+                    manager.set_spreadsheet_id(self.profile['spreadsheet_id'])
+                else:
+                    manager.set_spreadsheet_id(config.GOOGLE_SHEETS_CONFIG['spreadsheet_id'])
+                return manager
+            self._sheets_manager = self._timed('sheets manager', create)
+        return self._sheets_manager
+
+    @property
+    def notifier(self):
+        if self._notifier is None:
+            def create():
+                from email_notifier import EmailNotifier
+                return EmailNotifier(self.profile.get('recipient_email'),
+                                     self.state_path(config.OUTBOX_CONFIG['directory']))
+            self._notifier = self._timed('email notifier', create)
+        return self._notifier
+
+    def print_startup_report(self, command: str, ready: float, finished: float):
+        """Show where the time went before and during a CLI command"""
+        timings = {'imports': (ready - STARTED) * 1000}
+        timings.update(self.timings)
+        if self._sheets_manager is not None:
+            for name, ms in self._sheets_manager.timings.items():
+                timings[f"sheets {name}"] = ms
+
+        print(f"\nStartup report ({command}):")
+        for name, ms in timings.items():
+            print(f"  {name:<22} {ms:8.1f} ms")
+        print(f"  {'total':<22} {(finished - STARTED) * 1000:8.1f} ms")
+
+    @property
+    def journal(self):
+        if self._journal is None:
+            from ingest_journal import IngestJournal
+            from job_urls import canonical_job_url
+            self._journal = IngestJournal(
+                self.saved_jobs_file,
+                self.state_path(config.INGEST_CONFIG['checkpoint_file']),
+                self.state_path(config.INGEST_CONFIG['journal_file']),
+                compact_after=config.INGEST_CONFIG['compact_after_records'],
+                canonicalize=canonical_job_url,
+            )
+        return self._journal
+
+    @property
+    def seen_jobs(self):
+        if self._seen_jobs is None:
+            from seen_jobs import SeenJobs
+            seen = SeenJobs(self.state_path(config.DEDUP_CONFIG['seen_jobs_file']),
+                            capacity=config.DEDUP_CONFIG['expected_jobs'],
+                            error_rate=config.DEDUP_CONFIG['false_positive_rate'],
+                            save_every=config.DEDUP_CONFIG['bloom_save_every'])
+            if seen.is_empty:
+                # First run: remember what the sheet already holds
+                from job_urls import canonical_job_url
+                urls = [job['url'] for job in self.sheets_manager.query_jobs(['url']) if job.get('url')]
+                seen.add_many([canonical_job_url(url) for url in urls])
+            self._seen_jobs = seen
+        return self._seen_jobs
+
+    @property
+    def scorer(self):
+        if self._scorer is None:
+            from job_scoring import JobScorer
+            self._scorer = JobScorer(self.profile.get('job_criteria', config.JOB_CRITERIA),
+                                     config.SCORING_CONFIG['weights'])
+        return self._scorer
+
+    @property
+    def near_duplicates(self):
+        """Repost index, or None when NEAR_DUPLICATE_CONFIG is disabled"""
+        settings = config.NEAR_DUPLICATE_CONFIG
+        if self._near_duplicates is None and settings['enabled']:
+            from near_duplicates import NearDuplicateIndex
+            index = NearDuplicateIndex(self.state_path(settings['index_file']),
+                                       num_perm=settings['num_perm'], bands=settings['bands'],
+                                       threshold=settings['threshold'])
+            if index.is_empty:
+                # First run: index what the sheet already holds
+                from job_urls import canonical_job_url
+                jobs = [job for job in self.sheets_manager.query_jobs(NEAR_DUPLICATE_FIELDS) if job.get('url')]
+                for job in jobs:
+                    job['url'] = canonical_job_url(job['url'])
+                index.add(jobs)
+            self._near_duplicates = index
+        return self._near_duplicates
+
+    def read_saved_jobs(self, include_partial: bool = True):
+        """Read the job URLs appended to saved_jobs.txt since the last run"""
         if not os.path.exists(self.saved_jobs_file):
             print(f"No {self.saved_jobs_file} found. Creating new file...")
             with open(self.saved_jobs_file, 'w') as f:
                 f.write("# Add LinkedIn job URLs here (one per line)\n")
             return []
 
-        with open(self.saved_jobs_file, 'r') as f:
-            urls = [line.strip() for line in f.readlines()
-                   if line.strip() and not line.startswith('#')]
-
-        return urls
+        return self.journal.read_new(include_partial)
 
-    def clear_saved_jobs(self):
-        """Clear processed jobs from saved_jobs.txt"""
-        with open(self.saved_jobs_file, 'w') as f:
-            f.write("# Add LinkedIn job URLs here (one per line)\n")
-            f.write(f"# Last processed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    @contextmanager
+    def _outbox(self, needed: bool = True):
+        """Deliver emails sent in the block in the background (the daemon keeps it running)"""
+        if not needed or not config.OUTBOX_CONFIG['enabled'] or self.keep_outbox:
+            yield
+            return
+        self.notifier.start_outbox()
+        try:
+            yield
+        finally:
+            self.notifier.stop_outbox()
 
     def process_new_jobs(self):
         """Process new jobs from saved_jobs.txt"""
@@ -45,75 +208,243 @@ class LinkedInJobTracker:
         print("LinkedIn Job Tracker - Processing New Jobs")
         print("=" * 60)
 
-        # Read job URLs
-        job_urls = self.read_saved_jobs()
-
-        if not job_urls:
+        # Read new job URLs, plus any an interrupted run didn't finish
+        from ingest_journal import PENDING
+        new_urls = self.read_saved_jobs()
+        job_urls = self.journal.urls_in(PENDING)
+        ready_jobs = self.journal.resumable_jobs()
+        resumed = len(job_urls) - len(new_urls) + len(ready_jobs)
+        if resumed:
+            print(f"\nResuming {resumed} job(s) from an interrupted run")
+
+        # Deliver emails in the background while jobs are extracted and written
+        with self._outbox(bool(job_urls or ready_jobs) or self._has_queued_email()):
+            self._process_job_urls(job_urls, ready_jobs)
+
+    def _has_queued_email(self) -> bool:
+        """True if an earlier run left undelivered emails in the outbox"""
+        directory = self.state_path(config.OUTBOX_CONFIG['directory'])
+        return os.path.isdir(directory) and any(name.endswith('.json') for name in os.listdir(directory))
+
+    def _process_job_urls(self, job_urls: list, ready_jobs: list = ()):
+        """Extract, store and announce the given job URLs"""
+        if not job_urls and not ready_jobs:
             print("\nNo new jobs to process.")
             print(f"Add LinkedIn job URLs to '{self.saved_jobs_file}' (one per line)")
             return
 
-        print(f"\nFound {len(job_urls)} job(s) to process\n")
-
-        # Extract job details
-        print("Extracting job details...")
-        jobs_data = self.extractor.extract_multiple_jobs(job_urls)
+        print(f"\nFound {len(job_urls) + len(ready_jobs)} job(s) to process\n")
 
+        jobs_data, _ = self.process_batch(job_urls, ready_jobs)
         if not jobs_data:
-            print("No jobs were successfully extracted.")
             return
 
-        print(f"\nSuccessfully extracted {len(jobs_data)} job(s)")
-
-        # Add to Google Sheets
-        print("\nAdding jobs to Google Sheets...")
-        self.sheets_manager.add_jobs(jobs_data)
-
-        # Send notifications
-        if config.EMAIL_CONFIG['send_daily_digest']:
-            print("\nSending email notifications...")
-            for job in jobs_data:
-                self.notifier.send_new_job_notification(job)
-
-        # Clear processed jobs
-        self.clear_saved_jobs()
-
         print("\n" + "=" * 60)
         print("✓ Processing complete!")
         print("=" * 60)
         print(f"\nView your jobs at:")
         print(f"https://docs.google.com/spreadsheets/d/{self.sheets_manager.spreadsheet_id}")
 
+    def refresh_jobs(self, urls: List[str]):
+        """
+        Download tracked jobs again and update their rows
+
+        --process skips jobs already in the tracker; this rewrites their
+        extracted columns, Score and Duplicate Of from a fresh download
+        (Status, dates and Notes are kept). No notification is sent.
+        """
+        from ingest_journal import PENDING
+        from job_urls import canonical_job_url
+        job_urls = list(dict.fromkeys(canonical_job_url(url) for url in urls))
+        print(f"Refreshing {len(job_urls)} job(s)...")
+        self.journal.mark(job_urls, PENDING)
+        self.process_batch(job_urls, refresh=True)
+
+    def process_batch(self, job_urls: list, ready_jobs: list = (),
+                      refresh: bool = False) -> Tuple[list, Dict[str, float]]:
+        """
+        Extract, store and announce one batch of job URLs
+
+        The three stages run as a pipeline (see pipeline.JobPipeline): jobs are
+        written to the sheet in small batches while later pages are still
+        downloading. Each step is recorded in the ingest journal, so a crash
+        mid-batch is resumed from the last completed step.
+
+        Args:
+            job_urls: URLs to fetch
+            ready_jobs: Jobs already extracted by an interrupted run
+            refresh: Fetch jobs already in the tracker too and don't announce them (see refresh_jobs)
+
+        Returns:
+            The jobs written to the sheet and the milliseconds spent in each stage
+        """
+        from ingest_journal import FAILED, NOTIFIED, SKIPPED, WRITTEN
+        from pipeline import JobPipeline
+
+        # Jobs already in the tracker never cost a request (unless they're being refreshed)
+        if job_urls and not refresh:
+            tracked = {url for url in job_urls if url in self.seen_jobs}
+            if tracked:
+                print(f"Skipping {len(tracked)} job(s) already in the tracker")
+                self.journal.mark(sorted(tracked), SKIPPED)
+                job_urls = [url for url in job_urls if url not in tracked]
+
+        if not job_urls and not ready_jobs:
+            print("No new jobs to add.")
+            return [], {}
+
+        # Rows may have moved since the last batch (a daemon keeps one sheets manager)
+        self.sheets_manager.drop_stale_url_index()
+
+        def extract(urls):
+            for url, job in self.extractor.iter_jobs(urls):
+                if job:
+                    self.journal.mark_fetched([job])
+                    yield job
+                else:
+                    self.journal.mark([url], FAILED)
+
+        def write(jobs):
+            self.scorer.score_jobs(jobs)
+            if self.near_duplicates:
+                reposts = self.near_duplicates.flag(jobs)
+                if reposts:
+                    print(f"{reposts} job(s) look like reposts of jobs already tracked")
+            if not self.sheets_manager.upsert_jobs(jobs):
+                return False
+            urls = [job['url'] for job in jobs]
+            self.journal.mark(urls, WRITTEN)
+            self.seen_jobs.add_many(urls)
+            if self.near_duplicates:
+                self.near_duplicates.add(jobs)
+            return True
+
+        notify_enabled = config.EMAIL_CONFIG['send_daily_digest'] and not refresh
+        batched = config.EMAIL_CONFIG['notification_mode'] == 'batched'
+
+        def notify(jobs):
+            sent = True
+            if notify_enabled:
+                if batched:
+                    sent = self.notifier.send_new_jobs_notification(jobs)
+                else:
+                    for job in jobs:
+                        sent = self.notifier.send_new_job_notification(job) and sent
+            if sent:
+                self.journal.mark([job['url'] for job in jobs], NOTIFIED)
+
+        settings = config.PIPELINE_CONFIG
+        pipeline = JobPipeline(
+            extract, write, notify,
+            queue_size=settings['queue_size'],
+            write_batch_size=settings['write_batch_size'],
+            write_max_wait=settings['write_max_wait_seconds'],
+            max_write_batch=settings['max_write_batch_size'],
+            notify_batch_size=config.EMAIL_CONFIG['max_jobs_per_email'] if batched else 1,
+        )
+
+        print("Extracting job details and adding them to Google Sheets...")
+        with self.notifier.connection() if notify_enabled else nullcontext():
+            jobs_data = pipeline.run(job_urls, ready_jobs)
+
+        stats = pipeline.stats
+        if job_urls:
+            print(f"\nSuccessfully extracted {stats['extracted']}/{len(job_urls)} job(s)")
+            self.print_fetch_stats()
+        if stats['first_row_seconds'] is not None:
+            print(f"Sheets: {stats['written']} job(s) written in {stats['write_batches']} batch(es), "
+                  f"first after {stats['first_row_seconds']:.1f}s; "
+                  f"extraction waited {stats['blocked_seconds']:.1f}s for the sheet")
+        if stats['unwritten']:
+            print(f"{stats['unwritten']} job(s) were not saved to the spreadsheet, they will be retried on the next run")
+
+        return jobs_data, dict(pipeline.stage_ms)
+
+    def print_fetch_stats(self):
+        """Show connection reuse, streaming and cache counters of the extractor"""
+        stats = self.extractor.connection_stats()
+        print(f"HTTP: {stats['requests']} request(s) over {stats['connections']} connection(s), "
+              f"{stats['reused']} reused")
+        if self.extractor.streaming:
+            stream_stats = self.extractor.stream_stats
+            print(f"Streaming: {stream_stats['stopped_early']}/{stream_stats['pages']} page(s) stopped early, "
+                  f"{stream_stats['bytes_read'] / 1024:.0f} KB read, "
+                  f"{stream_stats['bytes_drained'] / 1024:.0f} KB drained for connection reuse, "
+                  f"{stream_stats['bytes_skipped'] / 1024:.0f} KB skipped "
+                  f"({stream_stats['connections_closed']} connection(s) closed)")
+        if self.extractor.cache:
+            cache_stats = self.extractor.cache.stats
+            print(f"Cache: {cache_stats['hits']} unchanged page(s) reused, "
+                  f"{cache_stats['evictions']} evicted")
+
     def send_daily_digest(self):
         """Send daily digest of all saved jobs"""
         print("Sending daily digest...")
 
-        # Get all jobs from sheets
-        all_jobs = self.sheets_manager.get_all_jobs()
-
-        # Filter jobs added today
+        # Get jobs added today, without the long Description column
         today = datetime.now().strftime('%Y-%m-%d')
-        today_jobs = [job for job in all_jobs if today in str(job[-1])]  # Last column is extracted_date
+        today_jobs = self.sheets_manager.get_jobs_extracted_on(today, DIGEST_FIELDS)
 
-        # Convert to dict format for email
+        # The score is stored in the sheet, so filtering and sorting never rescans job text
+        min_score = config.SCORING_CONFIG['digest_min_score']
         jobs_dict = []
         for job in today_jobs:
-            if len(job) >= 8:
-                jobs_dict.append({
-                    'title': job[0],
-                    'company': job[1],
-                    'location': job[2],
-                    'job_type': job[3],
-                    'experience_level': job[4],
-                    'posted_date': job[5],
-                    'url': job[6],
-                    'status': job[8] if len(job) > 8 else 'Saved'
-                })
-
-        # Send digest
-        self.notifier.send_daily_digest(jobs_dict)
+            job['status'] = job.get('status') or 'Saved'
+            if min_score and self._stored_score(job) < min_score:
+                continue
+            jobs_dict.append(job)
+        if config.SCORING_CONFIG['digest_sort_by_score']:
+            jobs_dict.sort(key=self._stored_score, reverse=True)
+
+        # Send digest (through the outbox, so a failed send is retried later)
+        with self._outbox():
+            self.notifier.send_daily_digest(jobs_dict)
         print("Daily digest sent!")
 
+    @staticmethod
+    def _stored_score(job: Dict) -> int:
+        """Score column of a job read from the sheet (-1 when it was never scored)"""
+        try:
+            return int(job.get('score'))
+        except (TypeError, ValueError):
+            return -1
+
+    def rescore_jobs(self):
+        """Score every job in the sheet again (after JOB_CRITERIA or the weights changed)"""
+        print("Rescoring jobs...")
+        jobs = self.sheets_manager.query_jobs(SCORED_FIELDS + ['score'])
+
+        changed = {}
+        for job in jobs:
+            score = self.scorer.score(job)
+            if str(score) != str(job.get('score')):
+                changed[job['row_number']] = score
+
+        if changed:
+            self.sheets_manager.update_job_scores(changed)
+        print(f"{len(changed)} of {len(jobs)} job score(s) changed")
+
+    def send_due_reminders(self):
+        """Send follow-up and deadline reminders that are due"""
+        from reminder_scheduler import ReminderScheduler
+
+        print("Checking reminders...")
+        scheduler = ReminderScheduler(self.state_path(config.REMINDER_CONFIG['state_file']))
+
+        # Only rebuild the schedule when the sheet changed since the last run
+        revision = self.sheets_manager.data_revision()
+        if revision is None or revision != scheduler.synced_revision:
+            scheduler.sync(self.sheets_manager.query_jobs(REMINDER_FIELDS), revision)
+
+        due = scheduler.pop_due()
+        if due:
+            with self._outbox(), self.notifier.connection():
+                for reminder in due:
+                    self.notifier.send_reminder(reminder['type'], reminder['job'])
+
+        scheduler.save()
+        print(f"{len(due)} reminder(s) sent, {len(scheduler.entries)} scheduled")
+
     def setup_new_tracker(self):
         """Initial setup - create Google Sheets"""
         print("=" * 60)
@@ -128,6 +459,8 @@ class LinkedInJobTracker:
             print(f"\nYour job tracker spreadsheet:")
             print(f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}")
             print(f"\nSave this spreadsheet ID: {spreadsheet_id}")
+            if self.profile:
+                print(f"(as 'spreadsheet_id' of config.PROFILES['{self.profile['name']}'])")
             print("\nNext steps:")
             print(f"1. Add LinkedIn job URLs to '{self.saved_jobs_file}'")
             print("2. Run: python main.py --process")
@@ -135,21 +468,87 @@ class LinkedInJobTracker:
             print("\n✗ Setup failed. Please check your credentials.")
 
 
+def profile_trackers(names: List[str] = None) -> List[LinkedInJobTracker]:
+    """One tracker per profile (all of config.PROFILES by default), sharing one extractor"""
+    from profiles import SharedExtractor, selected_profiles
+
+    def create():
+        from job_extractor import LinkedInJobExtractor
+        return LinkedInJobExtractor()
+
+    shared = SharedExtractor(create)
+    return [LinkedInJobTracker(extractor=shared, profile=profile) for profile in selected_profiles(names)]
+
+
+def run_profiles(command: str, names: List[str] = None) -> List[LinkedInJobTracker]:
+    """
+    Run a command for several profiles in one process
+
+    Profiles are handled one after another, but share the extractor: a job
+    saved by several people is downloaded and parsed once and written to
+    each of their sheets.
+    """
+    trackers = profile_trackers(names)
+    for tracker in trackers:
+        print(f"\n##### Profile: {tracker.profile['name']} #####\n")
+        if not tracker.profile['spreadsheet_id'] and command != '--setup':
+            print(f"No spreadsheet_id set for this profile. Run: python main.py --setup {tracker.profile['name']}")
+            continue
+        getattr(tracker, PROFILE_COMMANDS[command])()
+
+    stats = trackers[0].extractor.stats if trackers else {}
+    if stats.get('shared'):
+        print(f"\nShared extraction: {stats['fetched']} page(s) fetched, "
+              f"{stats['shared']} job(s) reused by another profile")
+    return trackers
+
+
+def write_run_report():
+    """Save the span and counter report of this run (see INSTRUMENTATION_CONFIG)"""
+    from instrumentation import metrics
+    metrics.write_reports(config.INSTRUMENTATION_CONFIG['report_file'],
+                          config.INSTRUMENTATION_CONFIG['prometheus_file'])
+
+
 def main():
     """Main entry point"""
     import sys
 
     tracker = LinkedInJobTracker()
-
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-
+    trackers = [tracker]
+    ready = time.perf_counter()
+    command = sys.argv[1] if len(sys.argv) > 1 else "--process"
+
+    if config.PROFILES and command in PROFILE_COMMANDS:
+        # Multi-profile mode: the command runs for the named profiles, or all of them
+        try:
+            trackers = run_profiles(command, sys.argv[2:])
+        except KeyError as error:
+            print(error.args[0])
+            return
+        if trackers:
+            tracker = trackers[0]
+    elif len(sys.argv) > 1:
         if command == "--setup":
             tracker.setup_new_tracker()
         elif command == "--process":
             tracker.process_new_jobs()
         elif command == "--digest":
             tracker.send_daily_digest()
+        elif command == "--reminders":
+            tracker.send_due_reminders()
+        elif command == "--rescore":
+            tracker.rescore_jobs()
+        elif command == "--refresh":
+            if len(sys.argv) > 2:
+                tracker.refresh_jobs(sys.argv[2:])
+            else:
+                print("Usage: python main.py --refresh <JOB_URL> [<JOB_URL> ...]")
+        elif command == "--daemon":
+            from tracker_daemon import TrackerDaemon
+            if config.PROFILES:
+                print("Note: the daemon only tracks the default saved_jobs.txt and sheet, not config.PROFILES")
+            TrackerDaemon(tracker).run()
         elif command == "--set-sheet":
             if len(sys.argv) > 2:
                 sheet_id = sys.argv[2]
@@ -162,11 +561,23 @@ def main():
             print("  --setup      : Create new Google Sheets tracker")
             print("  --process    : Process new jobs from saved_jobs.txt")
             print("  --digest     : Send daily digest email")
+            print("  --reminders  : Send follow-up and deadline reminders that are due")
+            print("  --rescore    : Recompute the Score column after changing JOB_CRITERIA")
+            print("  --refresh    : Download tracked jobs again and update their rows")
+            print("  --daemon     : Keep running, process new URLs as they are saved and send the digest daily")
             print("  --set-sheet  : Set spreadsheet ID to use")
+            if config.PROFILES:
+                print(f"\n--setup, --process, --digest, --reminders and --rescore run for every profile "
+                      f"({', '.join(config.PROFILES)}); add profile names to run only those")
     else:
         # Default: process new jobs
         tracker.process_new_jobs()
 
+    tracker.print_startup_report(command, ready, time.perf_counter())
+    write_run_report()
+    for tracker in trackers:
+        tracker.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,193 @@
+# Near Duplicates - Flags reposted jobs with MinHash signatures and an LSH index
+
+import hashlib
+import re
+import sqlite3
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles
+
+    The estimated Jaccard similarity of two texts is the share of signature
+    positions where they agree. Instead of num_perm permutations computed in
+    Python, each shingle is hashed by a few personalised BLAKE2b digests
+    whose 32-bit words serve as the num_perm hash functions; the signature
+    is the column-wise minimum over all shingles. The personalisation is
+    fixed, so signatures saved by earlier runs stay comparable.
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        digests = -(-num_perm // 16)  # a 64-byte digest holds sixteen 32-bit hashes
+        self.personal = [f'minhash{i}'.encode('ascii') for i in range(digests)]
+
+    def _hashes(self, shingle: str) -> array:
+        data = shingle.encode('utf-8')
+        words = array('I', b''.join(hashlib.blake2b(data, digest_size=64, person=person).digest()
+                                    for person in self.personal))
+        return words[:self.num_perm]
+
+    def shingles(self, text: str) -> set:
+        words = WORD_PATTERN.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def signature(self, text: str) -> Optional[Tuple[int, ...]]:
+        """Signature of the text, or None if it has no words"""
+        rows = [self._hashes(shingle) for shingle in self.shingles(text)]
+        if not rows:
+            return None
+        return tuple(map(min, zip(*rows)))
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """
+    Persistent LSH index of job signatures
+
+    Each signature is cut into bands of rows_per_band values; jobs sharing
+    any band land in the same bucket. A lookup reads the job's bands from an
+    indexed table and compares only the few candidates found there, so its
+    cost doesn't grow with the number of tracked jobs. With 16 bands of 4
+    rows, pairs above ~0.6 similarity are almost always candidates. Only
+    originals go into the buckets (a repost is matched to the original it
+    copies), so a role reposted many times doesn't grow its buckets.
+
+    Usage:
+        index = NearDuplicateIndex('near_duplicates.db')
+        index.flag(jobs)          # sets job['duplicate_of'] before the write
+        index.add(stored_jobs)    # once the jobs are in the sheet
+    """
+
+    def __init__(self, path: str, num_perm: int = 64, bands: int = 16, threshold: float = 0.8):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self.pending = {}  # url -> signature of a flagged job not yet added
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS signatures '
+                          '(url TEXT PRIMARY KEY, signature BLOB, duplicate_of TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS buckets (band INTEGER, key INTEGER, url TEXT)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS buckets_band_key ON buckets (band, key)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS buckets_url ON buckets (url)')
+        self.stats = {'lookups': 0, 'candidates': 0, 'duplicates': 0}
+
+    @property
+    def is_empty(self) -> bool:
+        return self.conn.execute('SELECT 1 FROM signatures LIMIT 1').fetchone() is None
+
+    @staticmethod
+    def text_of(job: Dict) -> str:
+        return f"{job.get('title') or ''} {job.get('description') or ''}"
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[int]:
+        keys = []
+        for band in range(self.bands):
+            values = signature[band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            digest = hashlib.blake2b(array('Q', values).tobytes(), digest_size=8).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+    def _stored_signature(self, url: str) -> Optional[Tuple[int, ...]]:
+        row = self.conn.execute('SELECT signature FROM signatures WHERE url = ?', (url,)).fetchone()
+        return tuple(array('Q', row[0])) if row else None
+
+    def _stored_original(self, url: str) -> Optional[str]:
+        """duplicate_of recorded when the job was indexed (None if it never was)"""
+        row = self.conn.execute('SELECT duplicate_of FROM signatures WHERE url = ?', (url,)).fetchone()
+        return (row[0] or '') if row else None
+
+    def find(self, signature: Tuple[int, ...], exclude: str = None) -> Optional[str]:
+        """URL of the most similar indexed job above the threshold, if any"""
+        self.stats['lookups'] += 1
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(url for (url,) in self.conn.execute(
+                'SELECT url FROM buckets WHERE band = ? AND key = ?', (band, key)))
+        candidates.discard(exclude)
+        self.stats['candidates'] += len(candidates)
+
+        best_url, best = None, self.threshold
+        for url in candidates:
+            other = self._stored_signature(url)
+            similarity = MinHasher.similarity(signature, other) if other else 0.0
+            if similarity >= best:
+                best_url, best = url, similarity
+        return best_url
+
+    def flag(self, jobs: List[Dict]) -> int:
+        """
+        Set job['duplicate_of'] to the URL of an earlier posting of the same role
+
+        Jobs already in the index keep pointing at the job they were first
+        matched with. Reposts within the batch are caught too.
+
+        Returns:
+            Number of jobs flagged
+        """
+        flagged = 0
+        batch = []  # (url, signature) of earlier jobs in this batch
+        for job in jobs:
+            url = job.get('url', '')
+            signature = self.hasher.signature(self.text_of(job))
+            job['duplicate_of'] = ''
+            if signature is None:
+                continue
+            self.pending[url] = signature
+
+            # A job seen before keeps its verdict, so an original never becomes a copy of its repost
+            original = self._stored_original(url)
+            if original is None:
+                original = self.find(signature, exclude=url)
+            if original is None:
+                for other_url, other in batch:
+                    if other_url != url and MinHasher.similarity(signature, other) >= self.threshold:
+                        original = other_url
+                        break
+            batch.append((url, signature))
+
+            if original:
+                job['duplicate_of'] = original
+                flagged += 1
+        self.stats['duplicates'] += flagged
+        return flagged
+
+    def add(self, jobs: List[Dict]):
+        """Index jobs that were stored (uses the signatures computed by flag)"""
+        signatures = {}
+        originals = {}
+        for job in jobs:
+            url = job.get('url', '')
+            originals[url] = job.get('duplicate_of') or ''
+            signature = self.pending.pop(url, None) or self.hasher.signature(self.text_of(job))
+            if signature is not None:
+                signatures[url] = signature
+        if not signatures:
+            return
+
+        with self.conn:
+            self.conn.executemany('DELETE FROM buckets WHERE url = ?', [(url,) for url in signatures])
+            self.conn.executemany('INSERT OR REPLACE INTO signatures (url, signature, duplicate_of) '
+                                  'VALUES (?, ?, ?)',
+                                  [(url, array('Q', signature).tobytes(), originals.get(url, ''))
+                                   for url, signature in signatures.items()])
+            self.conn.executemany('INSERT INTO buckets (band, key, url) VALUES (?, ?, ?)',
+                                  [(band, key, url) for url, signature in signatures.items()
+                                   if not originals[url]
+                                   for band, key in enumerate(self._band_keys(signature))])
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,193 @@
+# Pipeline - Runs job extraction, Sheets writes and emails concurrently
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List
+
+_END = object()  # end-of-stream marker passed down the queues
+
+
+class JobPipeline:
+    """
+    Streams jobs through extract -> write -> notify stages
+
+    Extraction runs in the calling thread; writing and notifying each run
+    in their own thread, connected by bounded queues. When a later stage
+    falls behind, the earlier one blocks on the full queue instead of
+    buffering the whole run. The writer upserts micro-batches (up to
+    write_batch_size jobs, or whatever arrived within write_max_wait
+    seconds), so the first rows reach the sheet while later pages are
+    still downloading. Jobs that queued up while a write was waiting for
+    Sheets quota are folded into the next write (up to max_write_batch),
+    so a throttled sheet gets fewer, larger writes instead of falling
+    further behind.
+
+    Args:
+        extract: Called with the URLs; yields extracted jobs as they finish
+        write: Called with a micro-batch of jobs; returns True if they were stored
+        notify: Called with up to notify_batch_size stored jobs
+    """
+
+    def __init__(self, extract: Callable[[List[str]], Iterable[Dict]],
+                 write: Callable[[List[Dict]], bool], notify: Callable[[List[Dict]], None],
+                 queue_size: int = 20, write_batch_size: int = 10, write_max_wait: float = 2.0,
+                 max_write_batch: int = None, notify_batch_size: int = 1):
+        self.extract = extract
+        self.write = write
+        self.notify = notify
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.notify_queue = queue.Queue(maxsize=queue_size)
+        self.write_batch_size = write_batch_size
+        self.write_max_wait = write_max_wait
+        self.max_write_batch = max(write_batch_size, max_write_batch or write_batch_size)
+        self.notify_batch_size = notify_batch_size
+        self.written = []
+        self.error = None
+        self._failed = threading.Event()
+        self.stats = {
+            'extracted': 0, 'written': 0, 'write_batches': 0, 'unwritten': 0,
+            'notified': 0, 'first_row_seconds': None,
+            'blocked_seconds': 0.0,  # time extraction waited for the writer (backpressure)
+        }
+        self.stage_ms = {'extract': 0.0, 'sheets': 0.0, 'email': 0.0}
+        self._started = None
+
+    def run(self, urls: List[str], ready_jobs: Iterable[Dict] = ()) -> List[Dict]:
+        """
+        Push ready_jobs, then the jobs extracted from urls, through the stages
+
+        Returns:
+            Jobs that were written to the sheet
+        """
+        self._started = time.perf_counter()
+        writer = threading.Thread(target=self._guard, args=(self._write_stage,), name='sheets-writer')
+        notifier = threading.Thread(target=self._guard, args=(self._notify_stage,), name='email-notifier')
+        writer.start()
+        notifier.start()
+
+        try:
+            for job in ready_jobs:
+                if not self._put(self.write_queue, job):
+                    break
+            if urls and not self._failed.is_set():
+                started = time.perf_counter()
+                for job in self.extract(urls):
+                    self.stats['extracted'] += 1
+                    if not self._put(self.write_queue, job):
+                        break
+                self.stage_ms['extract'] = (time.perf_counter() - started) * 1000
+        finally:
+            self._put(self.write_queue, _END, force=True)
+            writer.join()
+            notifier.join()
+
+        if self.error:
+            raise self.error
+        return self.written
+
+    def _guard(self, stage):
+        try:
+            stage()
+        except Exception as error:
+            self.error = error
+            self._failed.set()
+            # Unblock the other stages
+            self._drain(self.write_queue)
+            self._put(self.notify_queue, _END, force=True)
+
+    def _put(self, target: queue.Queue, item, force: bool = False) -> bool:
+        """Blocking put that gives up if a stage failed (force: always deliver the item)"""
+        try:
+            target.put_nowait(item)
+            return True
+        except queue.Full:
+            blocked = time.perf_counter()
+
+        while True:
+            if self._failed.is_set():
+                if not force:
+                    return False
+                self._drain(target)
+            try:
+                target.put(item, timeout=0.2)
+                break
+            except queue.Full:
+                continue
+        if target is self.write_queue:
+            self.stats['blocked_seconds'] += time.perf_counter() - blocked
+        return True
+
+    @staticmethod
+    def _drain(target: queue.Queue):
+        try:
+            while True:
+                target.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _write_stage(self):
+        finished = False
+        while not finished:
+            item = self.write_queue.get()
+            if item is _END:
+                break
+            batch = [item]
+
+            # Fill the micro-batch until it's full or the oldest job has waited long enough
+            deadline = time.monotonic() + self.write_max_wait
+            while len(batch) < self.write_batch_size:
+                try:
+                    item = self.write_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+
+            # Take whatever else is already waiting (it piled up during the last write)
+            while not finished and len(batch) < self.max_write_batch:
+                try:
+                    item = self.write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+
+            started = time.perf_counter()
+            stored = self.write(batch)
+            self.stage_ms['sheets'] += (time.perf_counter() - started) * 1000
+            if not stored:
+                self.stats['unwritten'] += len(batch)
+                continue
+
+            if self.stats['first_row_seconds'] is None:
+                self.stats['first_row_seconds'] = time.perf_counter() - self._started
+            self.stats['written'] += len(batch)
+            self.stats['write_batches'] += 1
+            self.written.extend(batch)
+            self._put(self.notify_queue, batch)
+
+        self._put(self.notify_queue, _END, force=True)
+
+    def _notify_stage(self):
+        pending = []
+        while True:
+            item = self.notify_queue.get()
+            if item is _END:
+                break
+            pending.extend(item)
+            while len(pending) >= self.notify_batch_size:
+                self._send(pending[:self.notify_batch_size])
+                pending = pending[self.notify_batch_size:]
+        if pending and not self._failed.is_set():
+            self._send(pending)
+
+    def _send(self, jobs: List[Dict]):
+        started = time.perf_counter()
+        self.notify(jobs)
+        self.stage_ms['email'] += (time.perf_counter() - started) * 1000
+        self.stats['notified'] += len(jobs)
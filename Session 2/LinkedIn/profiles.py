@@ -0,0 +1,86 @@
+# Profiles - Runs the tracker for several people in one go, fetching shared jobs once
+
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import config
+from instrumentation import metrics
+
+
+class SharedExtractor:
+    """
+    Extractor used by every profile of a run
+
+    Each job URL is fetched and parsed once per run; profiles that saved the
+    same job later in the run get a copy of the result instead of another
+    request. Everything else (connection_stats, cache, ...) is passed through
+    to the real extractor, which is only built when a page is first needed.
+
+    Args:
+        create: Builds the real extractor (e.g. LinkedInJobExtractor)
+    """
+
+    def __init__(self, create: Callable):
+        self._create = create
+        self._extractor = None
+        self.results = {}  # job URL -> extracted job, or None if extraction failed
+        self.lock = threading.Lock()
+        self.stats = {'fetched': 0, 'shared': 0}
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            self._extractor = self._create()
+        return self._extractor
+
+    def __getattr__(self, name: str):
+        return getattr(self.extractor, name)
+
+    def iter_jobs(self, job_urls: list) -> Iterator[Tuple[str, Optional[Dict]]]:
+        """Same as LinkedInJobExtractor.iter_jobs, answering URLs seen earlier in the run from memory"""
+        with self.lock:
+            known = [url for url in job_urls if url in self.results]
+        missing = [url for url in dict.fromkeys(job_urls) if url not in self.results]
+
+        for url in known:
+            self.stats['shared'] += 1
+            metrics.count('shared_extractions')
+            yield url, self._copy(self.results[url])
+
+        if not missing:
+            return
+        for url, job in self.extractor.iter_jobs(missing):
+            with self.lock:
+                self.results[url] = job
+                self.stats['fetched'] += 1
+            yield url, self._copy(job)
+
+    @staticmethod
+    def _copy(job: Optional[Dict]) -> Optional[Dict]:
+        # Each profile's pipeline gets its own dict, so one sink can't change another's job
+        return dict(job) if job else job
+
+
+def profile_settings(name: str) -> Dict:
+    """
+    Settings of one entry in config.PROFILES, with defaults filled in
+
+    State files (ingest journal, seen jobs, outbox, reminders, sheet replica)
+    live in PROFILES_DIR/<name>, so profiles never share progress.
+    """
+    if name not in config.PROFILES:
+        raise KeyError(f"Unknown profile '{name}'. Configured profiles: {', '.join(config.PROFILES)}")
+
+    profile = dict(config.PROFILES[name])
+    profile['name'] = name
+    profile['state_dir'] = os.path.join(config.PROFILES_DIR, name)
+    profile.setdefault('saved_jobs_file', os.path.join(profile['state_dir'], config.SAVED_JOBS_FILE))
+    profile.setdefault('spreadsheet_id', None)
+    profile.setdefault('recipient_email', config.EMAIL_CONFIG['recipient_email'])
+    return profile
+
+
+def selected_profiles(names: List[str] = None) -> List[Dict]:
+    """Settings of the named profiles, or of every configured profile"""
+    return [profile_settings(name) for name in (names or list(config.PROFILES))]
@@ -0,0 +1,68 @@
+# Rate Limiter - Token-bucket rate limiting for outbound requests
+
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket that refills at a fixed rate"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens the bucket can hold (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until the requested tokens are available
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """Keeps one token bucket per host so each site is paced independently"""
+
+    def __init__(self, requests_per_second: float, burst: float = 1.0):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot for the host of the given URL"""
+        host = urlparse(url).netloc.lower()
+
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self.buckets[host] = bucket
+
+        return bucket.acquire()
@@ -0,0 +1,142 @@
+# Reminder Scheduler - Decides when follow-up and deadline reminders are due
+
+import heapq
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import config
+
+
+DATE_FORMATS = ['%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y', '%d/%m/%Y', '%b %d, %Y']
+
+# Jobs with these statuses never get reminders
+CLOSED_STATUSES = {'rejected', 'withdrawn', 'offer', 'accepted', 'closed', 'not interested'}
+
+
+def parse_date(value: str) -> Optional[datetime]:
+    """Parse a date typed into the sheet, or return None"""
+    value = (value or '').strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+class ReminderScheduler:
+    """
+    Min-heap of reminder due times, persisted between runs
+
+    Reminders are derived from the sheet's Application Date and Follow-up
+    Date columns:
+      - follow_up: on the Follow-up Date if set, otherwise follow_up_days
+        after the Application Date
+      - deadline: application_deadline_reminder days before the Follow-up
+        Date of a job that has not been applied to yet
+
+    sync() rebuilds the index (only needed when the sheet changed); pop_due()
+    then costs O(k log n) for k due reminders out of n scheduled.
+    """
+
+    def __init__(self, state_file: str):
+        self.state_file = state_file
+        self.entries = {}  # reminder key -> entry
+        self.heap = []  # (due timestamp, key); stale items are skipped on pop
+        self.fired = set()  # keys already sent
+        self.synced_revision = None
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            print(f"Could not read {self.state_file}, rebuilding reminders from the sheet")
+            return
+
+        self.entries = state.get('entries', {})
+        self.fired = set(state.get('fired', []))
+        self.synced_revision = state.get('synced_revision')
+        self.heap = [(entry['due'], key) for key, entry in self.entries.items()]
+        heapq.heapify(self.heap)
+
+    def save(self):
+        state = {
+            'synced_revision': self.synced_revision,
+            'entries': self.entries,
+            'fired': sorted(self.fired),
+        }
+        tmp_path = self.state_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_file)
+
+    @staticmethod
+    def reminders_for_job(job: Dict) -> List[Dict]:
+        """Reminders a sheet row should have, each with a key that changes when its date changes"""
+        if (job.get('status') or '').strip().lower() in CLOSED_STATUSES:
+            return []
+
+        applied = parse_date(job.get('application_date'))
+        follow_up = parse_date(job.get('follow_up_date'))
+        details = {field: job.get(field, '') for field in ('title', 'company', 'url', 'row_number')}
+        reminders = []
+
+        if applied:
+            due = follow_up or applied + timedelta(days=config.REMINDER_CONFIG['follow_up_days'])
+            reminders.append({'type': 'follow_up', 'due': due})
+        elif follow_up:
+            due = follow_up - timedelta(days=config.REMINDER_CONFIG['application_deadline_reminder'])
+            reminders.append({'type': 'deadline', 'due': due})
+
+        for reminder in reminders:
+            reminder['key'] = f"{reminder['type']}|{job.get('url', '')}|{reminder['due']:%Y-%m-%d}"
+            reminder['due'] = reminder['due'].timestamp()
+            reminder['job'] = details
+        return reminders
+
+    def sync(self, jobs: List[Dict], revision: Optional[str] = None):
+        """Rebuild the schedule from sheet rows (only needed when the sheet changed)"""
+        wanted = {}
+        for job in jobs:
+            for reminder in self.reminders_for_job(job):
+                wanted[reminder['key']] = reminder
+
+        # Forget sent reminders whose job or date is gone so the set can't grow forever
+        self.fired &= set(wanted)
+
+        self.entries = {key: {'type': reminder['type'], 'due': reminder['due'], 'job': reminder['job']}
+                        for key, reminder in wanted.items() if key not in self.fired}
+        self.heap = [(entry['due'], key) for key, entry in self.entries.items()]
+        heapq.heapify(self.heap)
+        self.synced_revision = revision
+
+    def pop_due(self, now: float = None) -> List[Dict]:
+        """
+        Remove and return every reminder that is due
+
+        Returns:
+            List of {'type', 'due', 'job'} entries, earliest first
+        """
+        now = time.time() if now is None else now
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due_at, key = heapq.heappop(self.heap)
+            entry = self.entries.get(key)
+            if entry is None or entry['due'] != due_at:
+                continue  # replaced or removed since it was pushed
+            del self.entries[key]
+            self.fired.add(key)
+            due.append(entry)
+        return due
+
+    def next_due(self) -> Optional[float]:
+        """Timestamp of the earliest scheduled reminder"""
+        while self.heap and self.heap[0][1] not in self.entries:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
@@ -0,0 +1,115 @@
+# Seen Jobs - Remembers every tracked job so it is never fetched twice
+
+import hashlib
+import math
+import sqlite3
+from datetime import datetime
+from typing import List
+
+
+class BloomFilter:
+    """Fixed-size bit array answering "definitely new" or "maybe seen" without false negatives"""
+
+    def __init__(self, capacity: int, error_rate: float, bits: bytes = None):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits else bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class SeenJobs:
+    """
+    Persistent set of canonical job URLs already in the tracker
+
+    Most URLs checked are new, so the in-memory bloom filter answers those
+    without touching disk. Only "maybe seen" answers are confirmed against
+    the exact set in SQLite. New keys are committed on every add, but the
+    filter itself is only saved every save_every keys, on close() and when
+    it is rebuilt twice as large because the set outgrew it. A filter saved
+    for a different number of keys (e.g. after a crash) is rebuilt on open.
+    """
+
+    def __init__(self, path: str, capacity: int = 100000, error_rate: float = 0.001,
+                 save_every: int = 1000):
+        self.error_rate = error_rate
+        self.save_every = save_every
+        self.unsaved = 0  # keys added since the filter was last saved
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, added TEXT)')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value)')
+        self.stats = {'checks': 0, 'bloom_rejects': 0, 'exact_lookups': 0, 'false_positives': 0}
+
+        self.count = self.conn.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        meta = dict(self.conn.execute('SELECT name, value FROM meta'))
+        if meta.get('capacity') and meta.get('count') == self.count and meta.get('bloom'):
+            self.bloom = BloomFilter(int(meta['capacity']), error_rate, meta['bloom'])
+        else:
+            self._rebuild(max(capacity, self.count * 2))
+
+    @property
+    def is_empty(self) -> bool:
+        return self.count == 0
+
+    def _rebuild(self, capacity: int):
+        self.bloom = BloomFilter(capacity, self.error_rate)
+        for (key,) in self.conn.execute('SELECT key FROM seen'):
+            self.bloom.add(key)
+        self._save_bloom()
+
+    def _save_bloom(self):
+        self.conn.executemany('INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)', [
+            ('capacity', self.bloom.capacity),
+            ('count', self.count),
+            ('bloom', bytes(self.bloom.bits)),
+        ])
+        self.conn.commit()
+        self.unsaved = 0
+
+    def __contains__(self, key: str) -> bool:
+        self.stats['checks'] += 1
+        if key not in self.bloom:
+            self.stats['bloom_rejects'] += 1
+            return False
+
+        self.stats['exact_lookups'] += 1
+        found = self.conn.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None
+        if not found:
+            self.stats['false_positives'] += 1
+        return found
+
+    def add_many(self, keys: List[str]):
+        added = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        before = self.conn.total_changes
+        self.conn.executemany('INSERT OR IGNORE INTO seen (key, added) VALUES (?, ?)',
+                              [(key, added) for key in keys])
+        new_keys = self.conn.total_changes - before
+        self.count += new_keys
+        self.conn.commit()
+
+        if self.count > self.bloom.capacity:
+            self._rebuild(self.bloom.capacity * 2)
+            return
+        for key in keys:
+            self.bloom.add(key)
+        self.unsaved += new_keys
+        if self.unsaved >= self.save_every:
+            self._save_bloom()
+
+    def close(self):
+        if self.unsaved:
+            self._save_bloom()
+        self.conn.close()
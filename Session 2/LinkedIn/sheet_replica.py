@@ -0,0 +1,104 @@
+# Sheet Replica - Local SQLite copy of the Jobs worksheet
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+
+class SheetReplica:
+    """
+    Local read replica of the Jobs worksheet
+
+    Rows are stored by sheet row number with one TEXT column per job field.
+    A small meta table remembers which spreadsheet and revision the copy
+    belongs to, so callers can tell whether it is still current.
+    """
+
+    def __init__(self, path: str, fields: List[str]):
+        self.path = path
+        self.fields = fields
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        columns = ', '.join(f'"{field}" TEXT' for field in self.fields)
+        with self.lock, self.conn:
+            self.conn.execute(f'CREATE TABLE IF NOT EXISTS jobs (row_number INTEGER PRIMARY KEY, {columns})')
+
+            # Replicas made before a column was added to the sheet get it as an empty column
+            existing = {row[1] for row in self.conn.execute('PRAGMA table_info(jobs)')}
+            for field in self.fields:
+                if field not in existing:
+                    self.conn.execute(f'ALTER TABLE jobs ADD COLUMN "{field}" TEXT')
+            self.conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+            if 'extracted_date' in self.fields:
+                self.conn.execute('CREATE INDEX IF NOT EXISTS jobs_extracted_date ON jobs (extracted_date)')
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self.lock, self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, str(value)))
+
+    def _pad(self, values: List) -> List[str]:
+        """Sheets omits trailing empty cells; store them as empty strings"""
+        values = ['' if value is None else str(value) for value in values[:len(self.fields)]]
+        return values + [''] * (len(self.fields) - len(values))
+
+    def replace_all(self, rows: List[List], first_row: int = 2):
+        """Replace the whole replica with freshly downloaded rows"""
+        placeholders = ', '.join('?' * (len(self.fields) + 1))
+        records = [(first_row + offset, *self._pad(row)) for offset, row in enumerate(rows)]
+
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM jobs')
+            self.conn.executemany(f'INSERT INTO jobs VALUES ({placeholders})', records)
+
+    def write_cells(self, first_row: int, first_column: int, values: List[List]):
+        """Apply a rectangular block of cell writes, mirroring a Sheets update"""
+        with self.lock, self.conn:
+            for offset, row_values in enumerate(values):
+                row_number = first_row + offset
+                self.conn.execute('INSERT OR IGNORE INTO jobs (row_number) VALUES (?)', (row_number,))
+
+                fields = self.fields[first_column:first_column + len(row_values)]
+                assignments = ', '.join(f'"{field}" = ?' for field in fields)
+                self.conn.execute(f'UPDATE jobs SET {assignments} WHERE row_number = ?',
+                                  [str(value) for value in row_values[:len(fields)]] + [row_number])
+
+    def all_rows(self) -> List[List[str]]:
+        """All rows in sheet order, as lists of cell values"""
+        columns = ', '.join(f'COALESCE("{field}", \'\')' for field in self.fields)
+        with self.lock:
+            cursor = self.conn.execute(f'SELECT {columns} FROM jobs ORDER BY row_number')
+            return [list(row) for row in cursor]
+
+    def query(self, fields: List[str], start: Optional[str] = None,
+              end: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        Selected fields of the jobs extracted in [start, end)
+
+        Args:
+            fields: Job fields to return
+            start: Earliest extracted date (inclusive), e.g. '2024-05-01'
+            end: Latest extracted date (exclusive)
+        """
+        columns = ', '.join(f'COALESCE("{field}", \'\')' for field in fields)
+        conditions = []
+        params = []
+        if start:
+            conditions.append('extracted_date >= ?')
+            params.append(start)
+        if end:
+            conditions.append('extracted_date < ?')
+            params.append(end)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ''
+
+        with self.lock:
+            cursor = self.conn.execute(
+                f'SELECT row_number, {columns} FROM jobs {where}ORDER BY row_number', params)
+            return [dict(zip(['row_number'] + fields, row)) for row in cursor]
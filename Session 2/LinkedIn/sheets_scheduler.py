@@ -0,0 +1,148 @@
+# Sheets Scheduler - Paces Google Sheets API calls to the per-minute quota
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from googleapiclient.errors import HttpError
+from instrumentation import metrics
+from rate_limiter import TokenBucket
+
+
+# Status codes worth retrying: quota (429) and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Calls that may have been applied when a 5xx comes back; retrying them could
+# append the rows twice or create a second spreadsheet, so only 429 is retried
+NON_IDEMPOTENT_CALLS = {'values.append', 'spreadsheets.create'}
+
+
+class QuotaBudget:
+    """
+    One Sheets quota (reads or writes per minute) with AIMD pacing
+
+    Calls are paced by a token bucket whose rate starts at the quota. Each
+    success adds a small step back towards the quota (additive increase);
+    each 429 halves it (multiplicative decrease). A sliding one-minute
+    window makes sure bursts never exceed the quota itself.
+    """
+
+    def __init__(self, per_minute: int, burst: int, increase_step: float, decrease_factor: float):
+        self.per_minute = per_minute
+        self.increase_step = increase_step * per_minute / 60  # requests/second added per success
+        self.decrease_factor = decrease_factor
+        self.min_rate = 1 / 60  # never slower than one call a minute
+        self.bucket = TokenBucket(per_minute / 60, burst)
+        self.sent = deque()  # monotonic time of every call in the last minute
+        self.lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def acquire(self) -> float:
+        """Wait until a call fits the pacing rate and the quota window; returns seconds waited"""
+        waited = self.bucket.acquire()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.sent and now - self.sent[0] >= 60:
+                    self.sent.popleft()
+                if len(self.sent) < self.per_minute:
+                    self.sent.append(now)
+                    return waited
+                delay = 60 - (now - self.sent[0])
+            time.sleep(delay)
+            waited += delay
+
+    def on_success(self):
+        with self.bucket.lock:
+            self.bucket.rate = min(self.per_minute / 60, self.bucket.rate + self.increase_step)
+
+    def on_throttled(self):
+        with self.bucket.lock:
+            self.bucket.rate = max(self.min_rate, self.bucket.rate * self.decrease_factor)
+            self.bucket.tokens = min(self.bucket.tokens, 0.0)  # drop any saved-up burst
+
+
+class SheetsRequestScheduler:
+    """
+    Single gateway for Google Sheets API calls
+
+    Reads and writes have separate quotas in the Sheets API, so each gets its
+    own QuotaBudget. Throttled (429) and transient 5xx responses are retried
+    with full-jitter exponential backoff instead of being dropped; only after
+    max_retries is the error raised to the caller. A 429 means the call was
+    rejected, so it is retried for every call; 5xx only for idempotent ones.
+    """
+
+    def __init__(self, settings: Dict):
+        budgets = {
+            'read': settings['read_requests_per_minute'],
+            'write': settings['write_requests_per_minute'],
+        }
+        self.budgets = {
+            kind: QuotaBudget(per_minute, settings['burst'], settings['additive_increase'],
+                              settings['decrease_factor'])
+            for kind, per_minute in budgets.items()
+        }
+        self.max_retries = settings['max_retries']
+        self.backoff_base = settings['backoff_base_seconds']
+        self.backoff_max = settings['backoff_max_seconds']
+        self.stats = {'calls': 0, 'throttled': 0, 'retries': 0, 'waited_seconds': 0.0}
+        self.stats_lock = threading.Lock()
+
+    @staticmethod
+    def kind_of(name: str):
+        """'read' for get/batchGet calls, 'write' for other Sheets calls, None for Drive"""
+        if name.startswith('files.'):
+            return None  # Drive has its own, much larger quota
+        return 'read' if name.split('.')[-1] in ('get', 'batchGet') else 'write'
+
+    def execute(self, request, name: str, idempotent: bool = None):
+        """
+        Run a request within the quota, retrying throttled attempts
+
+        Args:
+            request: Google API request object
+            name: Call name, e.g. 'values.get' (picks the quota)
+            idempotent: Whether repeating the call is harmless (default: not in NON_IDEMPOTENT_CALLS)
+        """
+        if idempotent is None:
+            idempotent = name not in NON_IDEMPOTENT_CALLS
+        retry_statuses = RETRY_STATUSES if idempotent else {429}
+        budget = self.budgets.get(self.kind_of(name))
+        attempt = 0
+        while True:
+            waited = budget.acquire() if budget else 0.0
+            self._record(calls=1, waited_seconds=waited)
+            try:
+                with metrics.span(f'sheets.{name}'):
+                    result = request.execute()
+            except HttpError as error:
+                status = error.resp.status
+                if status == 429:
+                    metrics.count('sheets_quota_errors')
+                    self._record(throttled=1)
+                    if budget:
+                        budget.on_throttled()
+                if status not in retry_statuses or attempt >= self.max_retries:
+                    raise
+
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                attempt += 1
+                metrics.count('sheets_retries')
+                self._record(retries=1, waited_seconds=delay)
+                time.sleep(delay)
+                continue
+
+            if budget:
+                budget.on_success()
+            return result
+
+    def _record(self, **changes):
+        with self.stats_lock:
+            for key, value in changes.items():
+                self.stats[key] += value
@@ -0,0 +1,224 @@
+# Tracker Daemon - Keeps the tracker running and processes saved jobs as they arrive
+
+import json
+import os
+import signal
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict
+from instrumentation import metrics
+import config
+
+
+class DaemonStats:
+    """Queue depth and per-stage latency of a running daemon"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.batches = 0
+        self.failed_batches = 0
+        self.urls = 0
+        self.jobs = 0
+        self.digests = 0
+        self.stages = {}  # stage -> count, last/avg/max milliseconds
+
+    def record(self, stage: str, ms: float):
+        stats = self.stages.setdefault(stage, {'count': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0})
+        stats['count'] += 1
+        stats['total_ms'] += ms
+        stats['last_ms'] = ms
+        stats['max_ms'] = max(stats['max_ms'], ms)
+
+    def snapshot(self, queue_depth: int, oldest_wait: float) -> Dict:
+        return {
+            'updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'uptime_seconds': round(time.time() - self.started),
+            'queue_depth': queue_depth,
+            'oldest_wait_seconds': round(oldest_wait, 1),
+            'batches': self.batches,
+            'failed_batches': self.failed_batches,
+            'urls': self.urls,
+            'jobs': self.jobs,
+            'digests': self.digests,
+            'stages': {
+                stage: {
+                    'count': stats['count'],
+                    'last_ms': round(stats['last_ms'], 1),
+                    'avg_ms': round(stats['total_ms'] / stats['count'], 1),
+                    'max_ms': round(stats['max_ms'], 1),
+                }
+                for stage, stats in self.stages.items()
+            },
+        }
+
+
+class TrackerDaemon:
+    """
+    Long-running tracker: warm clients, micro-batches and a scheduled digest
+
+    URLs appended to saved_jobs.txt are queued and processed once batch_size
+    are waiting or the oldest has waited max_batch_wait_seconds. When a batch
+    fails or leaves jobs unwritten or un-notified, its unfinished jobs go back
+    to the front of the queue and are retried with exponential backoff. The daily digest (and due reminders) go out at
+    EMAIL_CONFIG['digest_time'].
+    """
+
+    def __init__(self, tracker, settings: Dict = None):
+        settings = settings or config.DAEMON_CONFIG
+        self.tracker = tracker
+        self.poll_seconds = settings['poll_seconds']
+        self.batch_size = settings['batch_size']
+        self.max_batch_wait = settings['max_batch_wait_seconds']
+        self.status_file = settings['status_file']
+        self.retry_base = settings['retry_base_seconds']
+        self.retry_max = settings['retry_max_seconds']
+        self.retry_delay = 0.0  # current backoff; 0 after a successful batch
+        self.retry_at = 0.0  # no batch runs before this time
+        self.queue = deque()  # (url, time queued)
+        self.ready_jobs = []  # extracted by an interrupted run, still to be written/notified
+        self._last_size = None  # size of saved_jobs.txt at the previous poll
+        self.stats = DaemonStats()
+        self.next_digest = self._next_digest_time(datetime.now())
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _next_digest_time(now: datetime):
+        if not config.EMAIL_CONFIG['send_daily_digest']:
+            return None
+        hour, minute = (int(part) for part in config.EMAIL_CONFIG['digest_time'].split(':'))
+        fire_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if fire_at <= now:
+            fire_at += timedelta(days=1)
+        return fire_at
+
+    def stop(self, *_):
+        self._stop.set()
+
+    def run(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        print(f"Watching {self.tracker.saved_jobs_file} every {self.poll_seconds}s "
+              f"(batches of {self.batch_size}, at most {self.max_batch_wait}s wait)")
+        if self.next_digest:
+            print(f"Next digest: {self.next_digest:%Y-%m-%d %H:%M}")
+
+        # Keep one outbox worker for the daemon's lifetime
+        if config.OUTBOX_CONFIG['enabled']:
+            self.tracker.notifier.start_outbox()
+            self.tracker.keep_outbox = True
+        try:
+            self._resume()
+            while not self._stop.is_set():
+                self._tick()
+                self._stop.wait(self.poll_seconds)
+        finally:
+            self.tracker.keep_outbox = False
+            self.tracker.notifier.stop_outbox()
+            self._write_status()
+            print("Daemon stopped")
+
+    def _resume(self):
+        """Queue the URLs an earlier run read but didn't finish"""
+        from ingest_journal import PENDING
+        now = time.time()
+        self.tracker.read_saved_jobs(include_partial=False)
+        self.queue.extend((url, now) for url in self.tracker.journal.urls_in(PENDING))
+        self.ready_jobs = self.tracker.journal.resumable_jobs()
+        if self.queue or self.ready_jobs:
+            print(f"Resuming {len(self.queue) + len(self.ready_jobs)} job(s)")
+
+    def _tick(self):
+        # A last line without a newline is read once the file stops growing
+        try:
+            size = os.path.getsize(self.tracker.saved_jobs_file)
+        except OSError:
+            size = None
+        stable, self._last_size = size == self._last_size, size
+
+        now = time.time()
+        for url in self.tracker.read_saved_jobs(include_partial=stable):
+            self.queue.append((url, now))
+
+        while time.time() >= self.retry_at and (
+                self.ready_jobs or (self.queue and (len(self.queue) >= self.batch_size
+                                                    or time.time() - self.queue[0][1] >= self.max_batch_wait))):
+            self._run_batch()
+
+        if self.next_digest and datetime.now() >= self.next_digest:
+            self._run_digest()
+
+        self._write_status()
+
+    def _run_batch(self):
+        batch = [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+        urls = [url for url, _ in batch]
+        ready_jobs, self.ready_jobs = self.ready_jobs, []
+        print(f"\nProcessing {len(urls) + len(ready_jobs)} job(s), {len(self.queue)} still queued")
+
+        started = time.perf_counter()
+        try:
+            jobs, stage_ms = self.tracker.process_batch(urls, ready_jobs)
+        except Exception as error:
+            self._retry_later(batch, f"Batch failed: {error}")
+            return
+
+        queued_at = batch[0][1] if batch else time.time()
+        self.stats.batches += 1
+        self.stats.urls += len(urls)
+        self.stats.jobs += len(jobs)
+        for stage, ms in stage_ms.items():
+            self.stats.record(stage, ms)
+        self.stats.record('batch', (time.perf_counter() - started) * 1000)
+        self.stats.record('queued_to_done', (time.time() - queued_at) * 1000)
+
+        # upsert_jobs/notifications report failures without raising; the journal knows what's left
+        unfinished = self.tracker.journal.resumable_jobs()
+        if unfinished:
+            self._retry_later(batch, f"{len(unfinished)} job(s) not yet written or notified")
+        else:
+            self.retry_delay = 0.0
+
+    def _retry_later(self, batch: list, reason: str):
+        """Requeue what a batch left unfinished and hold off the next batch (exponential backoff)"""
+        self.stats.failed_batches += 1
+        self._requeue_unfinished(batch)
+        self.retry_delay = min(self.retry_max, self.retry_delay * 2 or self.retry_base)
+        self.retry_at = time.time() + self.retry_delay
+        print(f"{reason}. Retrying in {self.retry_delay:.0f}s")
+
+    def _requeue_unfinished(self, batch: list):
+        """Put a failed batch's jobs back, as far as the journal says they got"""
+        from ingest_journal import PENDING
+        pending = set(self.tracker.journal.urls_in(PENDING))
+        queued = {url for url, _ in self.queue}
+        retry = [(url, queued_at) for url, queued_at in batch if url in pending and url not in queued]
+        self.queue.extendleft(reversed(retry))
+        # Jobs fetched (or written) before the failure continue from that step
+        self.ready_jobs = self.tracker.journal.resumable_jobs()
+
+    def _run_digest(self):
+        started = time.perf_counter()
+        try:
+            self.tracker.send_daily_digest()
+            self.tracker.send_due_reminders()
+            self.stats.digests += 1
+        except Exception as error:
+            print(f"Digest failed: {error}")
+        self.stats.record('digest', (time.perf_counter() - started) * 1000)
+        self.next_digest = self._next_digest_time(datetime.now())
+        print(f"Next digest: {self.next_digest:%Y-%m-%d %H:%M}")
+
+    def _write_status(self):
+        oldest_wait = time.time() - self.queue[0][1] if self.queue else 0.0
+        status = self.stats.snapshot(len(self.queue), oldest_wait)
+        tmp_path = self.status_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(status, f, indent=2)
+        os.replace(tmp_path, self.status_file)
+
+        # Counters and spans accumulate over the daemon's lifetime
+        metrics.write_reports(config.INSTRUMENTATION_CONFIG['report_file'],
+                              config.INSTRUMENTATION_CONFIG['prometheus_file'])